@@ -0,0 +1 @@
+"""Benchmarks for the inventory engine; run with ``python -m benchmarks``."""
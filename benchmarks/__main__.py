@@ -0,0 +1,43 @@
+import argparse
+import json
+import sys
+
+from benchmarks import suite
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmark the inventory query functions.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(suite.DEFAULT_SIZES),
+                        help="inventory sizes to generate (up to %d)" % suite.MAX_SIZE)
+    parser.add_argument("--modes", nargs="+", choices=("indexed", "scan"),
+                        default=["indexed", "scan"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="seconds spent timing each query per size")
+    parser.add_argument("--no-load", action="store_true", help="skip the CSV load case")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed p50 slowdown before a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    report = suite.run(args.sizes, args.modes, args.seed, args.budget, not args.no_load)
+    if args.output:
+        suite.save(report, args.output)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            regressions = suite.compare(json.load(handle), report, args.tolerance)
+        for regression in regressions:
+            print("REGRESSION %(case)s size=%(size)d mode=%(mode)s "
+                  "%(before_ms).3fms -> %(after_ms).3fms (x%(ratio).2f)" % regression,
+                  file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
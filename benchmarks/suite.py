@@ -0,0 +1,312 @@
+"""Benchmark harness for the inventory query functions.
+
+Generates synthetic inventories with a skewed category distribution and a
+realistic product-name vocabulary, times each query function and reports
+p50/p99 latency, throughput and peak traced memory as JSON, along with the
+memory cost of Product views against dict-per-product records and the
+throughput of batched stock movements. Two result files
+can be compared to flag regressions.
+"""
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import accumulate
+
+import skeleton
+from inventory import InventoryStore, load_file
+
+DEFAULT_SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+MAX_SIZE = 10 ** 7
+# Documented loader target: 1M CSV rows in under 5 seconds
+LOAD_TARGET_ROWS_PER_SEC = 200000
+
+BRANDS = ["Organic", "Fresh", "Premium", "Classic", "Value", "Golden", "Royal", "Daily",
+          "Smart", "Ultra", "Eco", "Home", "Pro", "Super", "Natural", "Pure"]
+ITEMS = ["Rice", "Wheat Flour", "Sugar", "Salt", "Tea", "Coffee", "Milk", "Butter",
+         "Mobile Charger", "USB Cable", "Headphones", "Power Bank", "Soap", "Shampoo",
+         "Detergent", "Notebook", "Pen", "Biscuits", "Oil", "Lentils", "Spices", "Juice",
+         "Batteries", "LED Bulb", "Toothpaste", "Towel", "Bottle", "Jam", "Honey", "Oats"]
+SIZES = ["100g", "250g", "500g", "1kg", "5kg", "1L", "2L", "Pack of 6", "XL", "Mini", ""]
+CATEGORIES = ["Grocery", "Electronics", "Personal Care", "Household", "Stationery",
+              "Beverages", "Dairy", "Snacks", "Baby Care", "Kitchen", "Pet Supplies",
+              "Hardware", "Toys", "Sports", "Garden", "Books", "Clothing", "Footwear",
+              "Automotive", "Health", "Frozen", "Bakery", "Meat", "Seafood", "Pharmacy",
+              "Office", "Lighting", "Furniture", "Jewellery", "Luggage"]
+
+THRESHOLDS = (5, 10, 25, 50)
+SEARCH_TERMS = ("rice", "Organic", "5kg", "charger", "pro", "xyz-no-match", "tea")
+PRICE_BANDS = (50, 100, 250, 500)
+
+QUERIES = {
+    "find_low_stock_items": lambda store, i: skeleton.find_low_stock_items(
+        THRESHOLDS[i % len(THRESHOLDS)], store=store),
+    "search_products": lambda store, i: skeleton.search_products(
+        SEARCH_TERMS[i % len(SEARCH_TERMS)], store=store),
+    "count_by_category": lambda store, i: skeleton.count_by_category(store=store),
+    "calculate_total_value": lambda store, i: skeleton.calculate_total_value(store=store),
+    "value_by_group": lambda store, i: skeleton.value_by_group(PRICE_BANDS, store=store),
+}
+
+
+def generate_rows(size, seed=0):
+    """Yield (product_id, name, category, quantity, price) rows.
+
+    Categories follow a Zipf-like distribution (a few categories hold most
+    of the catalog) and names combine a brand, an item and a pack size.
+    """
+    rng = random.Random(seed)
+    weights = list(accumulate(1.0 / (rank + 1) ** 1.1 for rank in range(len(CATEGORIES))))
+    categories = rng.choices(CATEGORIES, cum_weights=weights, k=size)
+    for i in range(size):
+        name = "%s %s %s" % (rng.choice(BRANDS), rng.choice(ITEMS), rng.choice(SIZES))
+        # Most items are well stocked; a long tail runs low
+        quantity = min(int(rng.expovariate(1 / 60.0)), 10000)
+        price = round(rng.lognormvariate(4.0, 1.0), 2)
+        yield "P%08d" % i, name.rstrip(), categories[i], quantity, price
+
+
+def build_store(size, seed=0, indexed=True, packed=False):
+    """Build a store of the given size, optionally with all indexes."""
+    store = InventoryStore(packed=packed)
+    rows = []
+    for row in generate_rows(size, seed):
+        rows.append(row)
+        if len(rows) == 100000:
+            store.extend(rows)
+            rows = []
+    store.extend(rows)
+    if indexed:
+        store.create_quantity_index()
+        store.create_name_index()
+        store.create_category_counter()
+        store.create_value_total()
+    return store
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def peak_memory(func):
+    """Return the peak bytes traced by tracemalloc while running func."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def time_calls(func, min_calls=5, max_calls=200, budget=1.0):
+    """Time func repeatedly within a time budget; return per-call seconds."""
+    latencies = []
+    deadline = time.perf_counter() + budget
+    while len(latencies) < max_calls and (len(latencies) < min_calls or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        func(len(latencies))
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def summarize(case, size, mode, latencies, rows, peak_bytes):
+    p50 = percentile(latencies, 0.50)
+    total = sum(latencies)
+    return {
+        "case": case,
+        "size": size,
+        "mode": mode,
+        "calls": len(latencies),
+        "p50_ms": p50 * 1000.0,
+        "p99_ms": percentile(latencies, 0.99) * 1000.0,
+        "ops_per_sec": len(latencies) / total if total else None,
+        "rows_per_sec": rows * len(latencies) / total if total else None,
+        "peak_bytes": peak_bytes,
+    }
+
+
+def bench_queries(store, size, mode, budget):
+    results = []
+    for case, query in sorted(QUERIES.items()):
+        query(store, 0)
+        latencies = time_calls(lambda i: query(store, i), budget=budget)
+        peak = peak_memory(lambda: query(store, 0))
+        results.append(summarize(case, size, mode, latencies, size, peak))
+    return results
+
+
+def build_lists(size, seed=0):
+    """Build the original layout: five parallel lists of Python objects."""
+    columns = ([], [], [], [], [])
+    for row in generate_rows(size, seed):
+        for column, value in zip(columns, row):
+            column.append(value)
+    return columns
+
+
+def held_memory(build):
+    """Return (result, traced bytes still held) for build()."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def bench_build(size, seed):
+    """Measure the traced bytes per row held by bare stores and by plain lists."""
+    results = []
+    for mode, build in (("columns", lambda: build_store(size, seed, indexed=False)),
+                        ("packed", lambda: build_store(size, seed, indexed=False, packed=True)),
+                        ("lists", lambda: build_lists(size, seed))):
+        built, held = held_memory(build)
+        rows = len(built) if mode != "lists" else len(built[0])
+        del built
+        results.append({"case": "build", "size": size, "mode": mode,
+                        "bytes_per_row": held / size if size else 0.0, "store_rows": rows})
+    return results
+
+
+def bench_products(size, seed):
+    """Compare Product views against one dict per product.
+
+    Reports the traced peak of materializing every product both ways, and
+    the time to stream every product view once.
+    """
+    store = build_store(size, seed, indexed=False)
+    fields = ("product_id", "name", "category", "quantity", "price")
+    results = []
+    for mode, materialize in (
+            ("view", lambda: list(store.products())),
+            ("dict", lambda: [dict(zip(fields, store.row(i))) for i in range(len(store))])):
+        gc.collect()
+        peak = peak_memory(materialize)
+        result = {"case": "products", "size": size, "mode": mode, "peak_bytes": peak,
+                  "bytes_per_row": peak / size if size else 0.0}
+        results.append(result)
+    latencies = time_calls(lambda i: sum(product.value for product in store.products()),
+                           min_calls=3, max_calls=20, budget=0.5)
+    streamed = summarize("products", size, "view_iter", latencies, size,
+                         peak_memory(lambda: sum(product.value for product in store.products())))
+    results.append(streamed)
+    return results
+
+
+def generate_movements(size, count, seed=0):
+    """Return count (product_id, delta) movements skewed towards popular products."""
+    rng = random.Random(seed)
+    movements = []
+    for _ in range(count):
+        product = min(int(rng.paretovariate(1.2)) - 1, size - 1)
+        # Restocks are rarer but larger than sales
+        delta = rng.randrange(20, 200) if rng.random() < 0.1 else -rng.randrange(1, 3)
+        movements.append(("P%08d" % rng.randrange(size) if rng.random() < 0.5 else "P%08d" % product,
+                          delta))
+    return movements
+
+
+def bench_movements(size, seed, batch_size=10000, budget=1.0):
+    """Time apply_movements batches against one update call per movement."""
+    store = build_store(size, seed, indexed=True)
+    store.create_id_index()
+    # Enough stock that repeated sales batches never drive a quantity negative
+    store.apply_movements([(product_id, 10 ** 6) for product_id in store.product_ids])
+    batch = generate_movements(size, batch_size, seed)
+    results = []
+    latencies = time_calls(lambda i: store.apply_movements(batch), min_calls=3, max_calls=50,
+                           budget=budget)
+    results.append(summarize("movements", size, "batch", latencies, len(batch), None))
+
+    def one_by_one(i):
+        for product_id, delta in batch[:1000]:
+            row = store.row_of(product_id)
+            store.set_quantity(row, store.quantities[row] + delta)
+    latencies = time_calls(one_by_one, min_calls=3, max_calls=50, budget=budget)
+    results.append(summarize("movements", size, "single", latencies, 1000, None))
+    return results
+
+
+def bench_load(size, seed):
+    """Time load_file on a generated CSV file (see inventory.loader)."""
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, "inventory.csv")
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write("product_id,name,category,quantity,price\n")
+            for row in generate_rows(size, seed):
+                handle.write("%s,%s,%s,%d,%.2f\n" % row)
+        store = InventoryStore()
+        store.create_quantity_index()
+        store.create_category_counter()
+        store.create_value_total()
+        start = time.perf_counter()
+        report = load_file(path, store)
+        elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(tmpdir)
+    result = summarize("load", size, "csv", [elapsed], report.rows_loaded, None)
+    result["errors"] = report.error_count
+    result["meets_target"] = result["rows_per_sec"] >= LOAD_TARGET_ROWS_PER_SEC
+    return result
+
+
+def run(sizes=DEFAULT_SIZES, modes=("indexed", "scan"), seed=0, budget=1.0, load=True):
+    """Run the suite and return the JSON-serialisable report."""
+    results = []
+    for size in sizes:
+        if size > MAX_SIZE:
+            raise ValueError("Sizes above %d are not supported" % MAX_SIZE)
+        results.extend(bench_build(size, seed))
+        results.extend(bench_products(size, seed))
+        results.extend(bench_movements(size, seed, budget=budget))
+        for mode in modes:
+            store = build_store(size, seed, indexed=(mode == "indexed"))
+            gc.collect()
+            results.extend(bench_queries(store, size, mode, budget))
+            del store
+        if load:
+            results.append(bench_load(size, seed))
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, tolerance=0.25):
+    """Return the cases whose p50 latency regressed by more than tolerance."""
+    def key(result):
+        return result["case"], result["size"], result["mode"]
+    previous = {key(result): result for result in baseline["results"] if "p50_ms" in result}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get(key(result))
+        if before is None or "p50_ms" not in result or not before["p50_ms"]:
+            continue
+        ratio = result["p50_ms"] / before["p50_ms"]
+        if ratio > 1.0 + tolerance:
+            regressions.append({"case": result["case"], "size": result["size"],
+                                "mode": result["mode"], "before_ms": before["p50_ms"],
+                                "after_ms": result["p50_ms"], "ratio": ratio})
+    return regressions
+
+
+def save(report, path):
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
@@ -0,0 +1,144 @@
+"""Asyncio front end serving the inventory menu to several operators at once.
+
+Each TCP or Unix-socket connection gets its own menu session against one
+shared in-memory inventory. Queries run in an executor so a slow
+full-catalog search in one session does not block the event loop, and other
+sessions keep getting answers. An optional background task can refresh the
+inventory periodically. The menu omits the profiling toggle: it would switch
+process-wide instrumentation for every session, and a cProfile capture on
+the event-loop thread never sees the queries running in the executor.
+
+Run with ``python console_server.py --port 8765`` (or ``--unix PATH``) and
+connect with e.g. ``nc localhost 8765``.
+"""
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import skeleton
+
+MENU = "\n".join(line for line in skeleton.MENU.splitlines() if not line.startswith("6."))
+
+
+class InventoryConsoleServer:
+    """Serves skeleton's menu over asyncio streams."""
+
+    def __init__(self, store=None, executor=None, refresh=None, refresh_interval=None):
+        self.store = skeleton.inventory if store is None else store
+        self.executor = executor or ThreadPoolExecutor(max_workers=4, thread_name_prefix="inventory-query")
+        self.refresh = refresh
+        self.refresh_interval = refresh_interval
+        self.sessions = 0
+        self._server = None
+        self._refresh_task = None
+
+    async def _query(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, store=self.store))
+
+    async def _run_choice(self, choice, reader, writer):
+        """Return the display lines for one menu choice, or None to end the session."""
+        async def ask(prompt):
+            writer.write(prompt.encode("utf-8"))
+            await writer.drain()
+            line = await reader.readline()
+            if not line:
+                raise EOFError
+            return line.decode("utf-8").rstrip("\r\n")
+
+        try:
+            if choice == "1":
+                threshold = int((await ask("Enter stock threshold (1-100): ")).strip())
+                return skeleton.format_low_stock(await self._query(skeleton.find_low_stock_items, threshold))
+            if choice == "2":
+                term = await ask("Enter search term: ")
+                return skeleton.format_search(await self._query(skeleton.search_products, term))
+            if choice == "3":
+                return skeleton.format_categories(await self._query(skeleton.count_by_category))
+            if choice == "4":
+                return skeleton.format_total(await self._query(skeleton.calculate_total_value))
+            if choice == "5":
+                return None
+            return ["Invalid choice. Please enter a number from 1 to 5."]
+        except (TypeError, ValueError) as e:
+            return [f"Invalid input: {e}"]
+
+    async def handle_session(self, reader, writer):
+        """Run one operator's menu loop until Exit or disconnect."""
+        self.sessions += 1
+        try:
+            while True:
+                writer.write((MENU + "\nEnter your choice (1-5): ").encode("utf-8"))
+                await writer.drain()
+                line = await reader.readline()
+                if not line:
+                    break
+                lines = await self._run_choice(line.decode("utf-8").strip(), reader, writer)
+                if lines is None:
+                    writer.write(b"Exiting Inventory Management System. Goodbye!\n")
+                    await writer.drain()
+                    break
+                writer.write(("\n".join(lines) + "\n").encode("utf-8"))
+        except (EOFError, ConnectionError):
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _refresh_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            store = await loop.run_in_executor(self.executor, self.refresh, self.store)
+            if store is not None:
+                self.store = store
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        """Start listening; returns the asyncio server."""
+        if unix_path:
+            self._server = await asyncio.start_unix_server(self.handle_session, path=unix_path)
+        else:
+            self._server = await asyncio.start_server(self.handle_session, host, port)
+        if self.refresh is not None and self.refresh_interval:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+        return self._server
+
+    async def close(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+
+async def serve(host, port, unix_path):
+    server = InventoryConsoleServer()
+    listener = await server.start(host, port, unix_path)
+    addresses = ", ".join(str(sock.getsockname()) for sock in listener.sockets)
+    print(f"Inventory console listening on {addresses}")
+    try:
+        await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the inventory menu to concurrent operators.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", dest="unix_path", help="listen on a Unix socket instead of TCP")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix_path))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
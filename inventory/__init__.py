@@ -0,0 +1,53 @@
+"""Inventory storage and query engine used by the console application."""
+from inventory.alerts import LowStockAlerts, LowStockEvent
+from inventory.batch import AhoCorasick, low_stock_batch, search_batch
+from inventory.cache import QueryCache
+from inventory.filters import Filter
+from inventory.fuzzy import BKTree, TokenIndex
+from inventory.indexes import (CategoryCounter, IdIndex, NGramIndex, QuantityIndex,
+                               StoreObserver, ValueTotal, count_codes, dot_product, fold)
+from inventory.instrumentation import Instrumentation
+from inventory.loader import LoadReport, RowError, load_file
+from inventory.sharding import ShardedInventory
+from inventory.snapshot import SnapshotError, SnapshotStore, open_snapshot, write_snapshot
+from inventory.store import CategoryColumn, InventoryStore, Product, StringHeap
+from inventory.valuation import GroupValue, PriceBands, Valuation
+from inventory.wal import DurableInventory
+
+__all__ = [
+    "AhoCorasick",
+    "BKTree",
+    "CategoryColumn",
+    "CategoryCounter",
+    "DurableInventory",
+    "Filter",
+    "GroupValue",
+    "IdIndex",
+    "Instrumentation",
+    "InventoryStore",
+    "LoadReport",
+    "LowStockAlerts",
+    "LowStockEvent",
+    "NGramIndex",
+    "PriceBands",
+    "Product",
+    "QuantityIndex",
+    "QueryCache",
+    "RowError",
+    "ShardedInventory",
+    "SnapshotError",
+    "SnapshotStore",
+    "StoreObserver",
+    "StringHeap",
+    "TokenIndex",
+    "Valuation",
+    "ValueTotal",
+    "count_codes",
+    "dot_product",
+    "fold",
+    "load_file",
+    "low_stock_batch",
+    "open_snapshot",
+    "search_batch",
+    "write_snapshot",
+]
@@ -0,0 +1,137 @@
+"""Edge-triggered low-stock alert subscriptions.
+
+Clients subscribe a threshold, either for the whole inventory or for one
+category, and are told when a product crosses it: when its quantity drops
+to or below the threshold, or (if they ask for it) when it recovers above.
+Products that simply stay low do not notify again.
+
+LowStockAlerts is a store observer, so thresholds are evaluated only for
+the rows a mutation touches. Subscriptions are kept sorted by threshold per
+scope, and a quantity change from ``old`` to ``new`` finds the crossed
+thresholds by bisection, so the cost follows the changes and the alerts
+actually raised rather than the catalog size or the subscription count.
+Bulk loads (``rebuild``) do not notify.
+"""
+import asyncio
+from bisect import bisect_left, insort
+from collections import deque, namedtuple
+from itertools import count
+
+from inventory.indexes import StoreObserver
+
+LowStockEvent = namedtuple("LowStockEvent", "product_id name category quantity threshold low")
+
+
+class Subscription:
+    """A registered threshold; pass it to ``unsubscribe`` to cancel."""
+
+    __slots__ = ("threshold", "category", "callback", "queue", "loop", "recovery", "_key")
+
+    def __init__(self, threshold, category, callback, queue, loop, recovery, key):
+        self.threshold = threshold
+        self.category = category
+        self.callback = callback
+        self.queue = queue
+        self.loop = loop
+        self.recovery = recovery
+        self._key = key
+
+    def deliver(self, event):
+        if self.callback is not None:
+            self.callback(event)
+        if self.queue is not None:
+            if self.loop is not None and not self.loop.is_closed():
+                self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+            else:
+                self.queue.put_nowait(event)
+
+
+class LowStockAlerts(StoreObserver):
+    """Threshold subscriptions notified as mutations cross them.
+
+    Callbacks run synchronously on the mutating thread. Queue subscribers
+    created inside a running event loop are fed through
+    ``call_soon_threadsafe``, so mutations may come from any thread. A
+    failing callback never interrupts the mutation; the error is kept in
+    ``errors`` (most recent last).
+    """
+
+    def __init__(self, max_errors=100):
+        # scope (None for global, else category) -> sorted [(threshold, seq, Subscription)]
+        self._scopes = {}
+        self._sequence = count()
+        self.delivered = 0
+        self.errors = deque(maxlen=max_errors)
+
+    def __len__(self):
+        return sum(map(len, self._scopes.values()))
+
+    def subscribe(self, threshold, callback=None, queue=None, category=None, recovery=False):
+        """Register a threshold for every product, or for one category.
+
+        Events go to ``callback(event)`` and/or ``queue`` (an asyncio.Queue or
+        anything with ``put_nowait``). With ``recovery`` the subscriber also
+        hears when a product climbs back above the threshold.
+        """
+        if threshold is None or isinstance(threshold, bool) or not isinstance(threshold, int):
+            raise TypeError("Threshold must be an integer")
+        if callback is None and queue is None:
+            raise ValueError("Provide a callback or a queue")
+        if category is not None and not isinstance(category, str):
+            raise TypeError("Category must be a string")
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        key = (threshold, next(self._sequence))
+        subscription = Subscription(threshold, category, callback, queue,
+                                    loop if queue is not None else None, recovery, key)
+        insort(self._scopes.setdefault(category, []), key + (subscription,))
+        return subscription
+
+    def unsubscribe(self, subscription):
+        entries = self._scopes.get(subscription.category, [])
+        position = bisect_left(entries, subscription._key)
+        if position < len(entries) and entries[position][2] is subscription:
+            del entries[position]
+            if not entries:
+                del self._scopes[subscription.category]
+
+    def _notify(self, store, row, category, old, new):
+        """Deliver events for thresholds in category's scope crossed by old -> new."""
+        entries = self._scopes.get(category)
+        if not entries or old == new:
+            return
+        low = new < old
+        # A drop crosses thresholds t with new <= t < old; a rise those with old <= t < new
+        start = bisect_left(entries, (min(old, new),))
+        end = bisect_left(entries, (max(old, new),))
+        for _, _, subscription in entries[start:end]:
+            if low or subscription.recovery:
+                event = LowStockEvent(store.product_ids[row], store.names[row],
+                                      store.categories[row], store.quantities[row],
+                                      subscription.threshold, low)
+                try:
+                    subscription.deliver(event)
+                    self.delivered += 1
+                except Exception as error:
+                    self.errors.append((event, error))
+
+    def _quantity_changed(self, store, row, old, new):
+        if self._scopes:
+            self._notify(store, row, None, old, new)
+            self._notify(store, row, store.categories[row], old, new)
+
+    def row_added(self, store, row):
+        # A new product counts as arriving from unlimited stock
+        quantity = store.quantities[row]
+        self._quantity_changed(store, row, float("inf"), quantity)
+
+    def row_changed(self, store, row, field, old, new):
+        if field == "quantity":
+            self._quantity_changed(store, row, old, new)
+        elif field == "category" and old != new:
+            # Leaving a category's scope counts as recovering, entering as a drop
+            quantity = store.quantities[row]
+            self._notify(store, row, old, quantity, float("inf"))
+            self._notify(store, row, new, float("inf"), quantity)
@@ -0,0 +1,118 @@
+"""Batch queries that answer many thresholds or search terms in one pass."""
+from bisect import bisect_left
+from collections import deque
+from heapq import merge
+
+from inventory.indexes import fold
+from inventory.store import take
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton reporting which patterns occur in a text."""
+
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        outputs = [[]]
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(index)
+        # Breadth-first pass sets failure links and folds in suffix outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                outputs[next_state].extend(outputs[self._fail[next_state]])
+        self._outputs = [tuple(output) for output in outputs]
+
+    def matches(self, text):
+        """Return the set of pattern indexes that occur in text."""
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+
+def _low_stock_rows(store, thresholds):
+    """Return, per threshold, the rows with quantity <= threshold in row order."""
+    ordered = sorted(set(thresholds))
+    if store.quantity_index is not None:
+        by_threshold = {threshold: store.quantity_index.rows_at_most(threshold)
+                        for threshold in ordered}
+    else:
+        # One sweep: each row lands in the bucket of the smallest threshold
+        # that includes it; larger thresholds merge the buckets below them.
+        buckets = [[] for _ in ordered]
+        limit = len(ordered)
+        for row, quantity in enumerate(store.quantities):
+            position = bisect_left(ordered, quantity)
+            if position < limit:
+                buckets[position].append(row)
+        by_threshold = {}
+        rows = []
+        for threshold, bucket in zip(ordered, buckets):
+            if bucket:
+                rows = list(merge(rows, bucket)) if rows else bucket
+            by_threshold[threshold] = rows
+    return [by_threshold[threshold] for threshold in thresholds]
+
+
+def low_stock_batch(store, thresholds):
+    """Answer several low-stock thresholds with one pass over the quantities.
+
+    Returns one (ids, names, quantities) tuple per threshold, in input order.
+    """
+    product_ids = store.product_ids
+    names = store.names
+    quantities = store.quantities
+    return [(take(product_ids, rows), take(names, rows), [quantities[i] for i in rows])
+            for rows in _low_stock_rows(store, thresholds)]
+
+
+def search_batch(store, terms):
+    """Answer several case-insensitive substring searches in one pass.
+
+    Every folded name is scanned once by an Aho-Corasick automaton over
+    all folded terms. Returns one (ids, names) tuple per term, in input order.
+    """
+    folded_terms = [fold(term) for term in terms]
+    distinct = list(dict.fromkeys(term for term in folded_terms if term))
+    rows_by_term = {term: [] for term in distinct}
+    if distinct:
+        automaton = AhoCorasick(distinct)
+        for row, folded in enumerate(store.folded_names):
+            for index in automaton.matches(folded):
+                rows_by_term[distinct[index]].append(row)
+    product_ids = store.product_ids
+    names = store.names
+    results = []
+    for term in folded_terms:
+        if not term:
+            results.append((list(product_ids), list(names)))
+            continue
+        rows = rows_by_term[term]
+        results.append((take(product_ids, rows), take(names, rows)))
+    return results
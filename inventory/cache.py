@@ -0,0 +1,130 @@
+"""Bounded result cache for the low_stock and search queries."""
+import threading
+import time
+from collections import OrderedDict
+
+from inventory.indexes import StoreObserver, fold
+
+
+def _copy(result):
+    # Callers get their own lists so mutating a result cannot corrupt the cache
+    return tuple(list(part) for part in result)
+
+
+class QueryCache(StoreObserver):
+    """LRU cache of query results with optional TTL and precise invalidation.
+
+    Entries are keyed by ``(query, argument)``. As an observer the cache
+    drops only the entries a mutation can affect: a low_stock threshold is
+    dropped when the touched row's quantity is at or below it, a search term
+    when it occurs in the touched row's folded name. The store's ``generation``
+    counter catches mutations the cache did not see (for example inside
+    ``bulk_load``); any mismatch clears the whole cache.
+    """
+
+    def __init__(self, maxsize=256, ttl=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.generation = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return the hit, miss, eviction, expiration and invalidation counts."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "expirations": self.expirations, "invalidations": self.invalidations,
+                    "size": len(self._entries)}
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def get(self, store, query, argument, compute):
+        """Return the cached result for query(argument), computing it on a miss."""
+        key = (query, argument)
+        with self._lock:
+            generation = store.generation
+            if self.generation != generation:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                self.generation = generation
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, expires = entry
+                if expires is None or self.clock() < expires:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _copy(result)
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+        result = compute(argument)
+        with self._lock:
+            # Skip the store if a mutation landed while computing
+            if store.generation == generation == self.generation:
+                expires = None if self.ttl is None else self.clock() + self.ttl
+                self._entries[key] = (result, expires)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return _copy(result)
+
+    def _invalidate(self, store, quantity=None, names=()):
+        """Drop entries affected by a row with this quantity and these folded names."""
+        with self._lock:
+            self.generation = store.generation
+            stale = []
+            for key in self._entries:
+                query, argument = key
+                if query == "low_stock":
+                    if quantity is not None and quantity <= argument:
+                        stale.append(key)
+                elif any(argument in name for name in names):
+                    stale.append(key)
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def rebuild(self, store):
+        self.clear()
+        with self._lock:
+            self.generation = store.generation
+
+    def row_added(self, store, row):
+        self._invalidate(store, store.quantities[row], (store.folded_names[row],))
+
+    def row_changed(self, store, row, field, old, new):
+        if field == "quantity":
+            self._invalidate(store, min(old, new))
+        elif field == "name":
+            self._invalidate(store, store.quantities[row], (fold(old), store.folded_names[row]))
+        else:
+            self._invalidate(store)
+
+    def rows_changed(self, store, rows, field, old, new):
+        if field == "quantity":
+            self._invalidate(store, min(min(old), min(new)) if rows else None)
+        elif field == "name":
+            self._invalidate(store, min(store.quantities[row] for row in rows) if rows else None,
+                             [fold(name) for name in old] + [store.folded_names[row] for row in rows])
+        else:
+            self._invalidate(store)
+
+    def row_removed(self, store, row):
+        self._invalidate(store, store.quantities[row], (store.folded_names[row],))
+
+    def row_moved(self, store, old_row, new_row):
+        # Results are in row order, so the moved row's entries change order
+        self._invalidate(store, store.quantities[new_row], (store.folded_names[new_row],))
@@ -0,0 +1,179 @@
+"""Multi-criteria filters planned over the store's indexes.
+
+A Filter combines predicates on category, a quantity range, a price range
+and a name substring. The planner estimates how many rows each indexable
+predicate can match (the quantity index by bisection, the n-gram index by
+its shortest posting list), starts from the most selective one and
+intersects further index results as int bitmaps while their estimate stays
+within INTERSECT_RATIO of the candidates so far. Every other predicate is
+checked row by row on the surviving candidates; with no usable index the
+plan is a single scan.
+"""
+import math
+
+from inventory.indexes import fold
+
+# Intersect another index only if it matches at most this many times more rows
+INTERSECT_RATIO = 4
+
+
+def rows_to_bitmap(rows, size):
+    """Return an int with bit r set for every row r."""
+    bits = bytearray((size + 7) >> 3)
+    for row in rows:
+        bits[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(bits, "little")
+
+
+def bitmap_rows(bitmap, size):
+    """Return the rows whose bits are set, in row order."""
+    rows = []
+    for index, byte in enumerate(bitmap.to_bytes((size + 7) >> 3, "little")):
+        if byte:
+            base = index << 3
+            for bit in range(8):
+                if byte >> bit & 1:
+                    rows.append(base + bit)
+    return rows
+
+
+def _check_bound(value, label, types):
+    if value is not None and (isinstance(value, bool) or not isinstance(value, types)):
+        raise TypeError("%s must be a number" % label)
+
+
+class Filter:
+    """A conjunction of predicates; None leaves a criterion unrestricted.
+
+    Quantity and price bounds are inclusive, and name_contains matches
+    folded names like search.
+    """
+
+    def __init__(self, category=None, min_quantity=None, max_quantity=None,
+                 min_price=None, max_price=None, name_contains=None):
+        if category is not None and not isinstance(category, str):
+            raise TypeError("Category must be a string")
+        if name_contains is not None and not isinstance(name_contains, str):
+            raise TypeError("Search term must be a string")
+        for value, label in ((min_quantity, "Minimum quantity"), (max_quantity, "Maximum quantity"),
+                             (min_price, "Minimum price"), (max_price, "Maximum price")):
+            _check_bound(value, label, (int, float))
+        self.category = category
+        # Quantities are integers, so fractional bounds round inwards
+        self.min_quantity = None if min_quantity is None else math.ceil(min_quantity)
+        self.max_quantity = None if max_quantity is None else math.floor(max_quantity)
+        self.min_price = min_price
+        self.max_price = max_price
+        self.term = None if name_contains is None else fold(name_contains)
+
+    @property
+    def has_quantity(self):
+        return self.min_quantity is not None or self.max_quantity is not None
+
+    @property
+    def has_price(self):
+        return self.min_price is not None or self.max_price is not None
+
+    def checks(self, store, skip=()):
+        """Return (name, predicate) row checks, cheapest first, leaving out skip."""
+        checks = []
+        if self.category is not None and "category" not in skip:
+            codes = store.category_codes
+            code = store._category_lookup.get(self.category)
+            checks.append(("category", lambda row: codes[row] == code))
+        if self.has_quantity and "quantity" not in skip:
+            quantities = store.quantities
+            min_quantity = -math.inf if self.min_quantity is None else self.min_quantity
+            max_quantity = math.inf if self.max_quantity is None else self.max_quantity
+            checks.append(("quantity", lambda row: min_quantity <= quantities[row] <= max_quantity))
+        if self.has_price and "price" not in skip:
+            prices = store.prices
+            min_price = -math.inf if self.min_price is None else self.min_price
+            max_price = math.inf if self.max_price is None else self.max_price
+            checks.append(("price", lambda row: min_price <= prices[row] <= max_price))
+        if self.term is not None and "name" not in skip:
+            folded_names = store.folded_names
+            term = self.term
+            checks.append(("name", lambda row: term in folded_names[row]))
+        return checks
+
+
+class Plan:
+    """The planner's choice: index sources to intersect, then row checks.
+
+    ``sources`` lists (index, estimated rows) in the order they are used;
+    an empty list means a full scan.
+    """
+
+    def __init__(self, sources, fetch, checks, empty=False):
+        self.sources = sources
+        self._fetch = fetch
+        self.checks = checks
+        self.empty = empty
+
+    def describe(self):
+        """Return one line per step, e.g. for an operator-facing explain."""
+        if self.empty:
+            return ["empty: no row can match"]
+        lines = ["index %s (~%d rows)" % source for source in self.sources] or ["scan all rows"]
+        if self.checks:
+            lines.append("check " + ", ".join(name for name, _ in self.checks))
+        return lines
+
+
+def plan(store, criteria):
+    """Choose how to evaluate criteria against store."""
+    if criteria.category is not None and criteria.category not in store._category_lookup:
+        return Plan([], [], [], empty=True)
+    options = []
+    if criteria.has_quantity and store.quantity_index is not None:
+        low, high = criteria.min_quantity, criteria.max_quantity
+        quantity_index = store.quantity_index
+        options.append(("quantity", quantity_index.count_between(low, high),
+                        lambda: quantity_index.rows_between(low, high), True))
+    if criteria.term is not None and store.name_index is not None:
+        estimate = store.name_index.estimate(criteria.term)
+        if estimate is not None:
+            name_index = store.name_index
+            term = criteria.term
+            # n-gram candidates still need the exact substring check
+            options.append(("name", estimate, lambda: name_index.candidates(term), False))
+    options.sort(key=lambda option: option[1])
+    sources, fetch, exact = [], [], set()
+    for name, estimate, rows, is_exact in options:
+        if sources and estimate > sources[-1][1] * INTERSECT_RATIO:
+            break
+        sources.append((name, estimate))
+        fetch.append(rows)
+        if is_exact:
+            exact.add(name)
+    if sources and sources[0][1] == 0:
+        return Plan(sources[:1], [], [], empty=True)
+    return Plan(sources, fetch, criteria.checks(store, skip=exact))
+
+
+def run(store, criteria, chosen=None):
+    """Return the rows matching criteria, in row order."""
+    chosen = plan(store, criteria) if chosen is None else chosen
+    if chosen.empty:
+        return []
+    if not chosen._fetch:
+        candidates = range(len(store))
+        store.rows_scanned += len(store)
+    elif len(chosen._fetch) == 1:
+        candidates = sorted(chosen._fetch[0]())
+        store.rows_scanned += len(candidates)
+    else:
+        size = len(store)
+        bitmap = -1
+        for fetch in chosen._fetch:
+            bitmap &= rows_to_bitmap(fetch(), size)
+            if not bitmap:
+                return []
+        candidates = bitmap_rows(bitmap, size)
+        store.rows_scanned += len(candidates)
+    rows = list(candidates)
+    # One pass per check, cheapest first, so later checks see fewer rows
+    for _, check in chosen.checks:
+        rows = [row for row in rows if check(row)]
+    return rows
@@ -0,0 +1,265 @@
+"""Ranked prefix and typo-tolerant name search over a token index.
+
+Folded names (see inventory.indexes.fold) are split into word tokens. TokenIndex keeps, per token,
+the sorted rows containing it (an ``array('I')`` posting list), the
+vocabulary in sorted order, so every token sharing a prefix is one
+contiguous bisected slice, and a BK-tree over the vocabulary for
+bounded-edit-distance lookups.
+
+Each query token is scored against name tokens: an exact match scores 1, a
+prefix match between 0.5 and 1 depending on how much of the token it
+covers, and a match within the edit-distance bound below 0.5. Adjacent
+transpositions count as a single edit, so "whaet" still finds "wheat".
+A row's score is the sum over query tokens of its best match, and every
+query token must match something. Results are the top k by score, ties
+going to the earlier row, collected with a heap over rows streamed in row
+order, so there is no full sort and the stream stops once k rows hold the
+best possible score.
+"""
+import heapq
+import re
+from array import array
+from bisect import bisect_left, bisect_right, insort
+
+from inventory.indexes import StoreObserver, fold
+
+_TOKEN = re.compile(r"\w+")
+_MAX_CHAR = "\U0010ffff"
+
+
+def _tokens(folded):
+    return list(dict.fromkeys(_TOKEN.findall(folded)))
+
+
+def tokenize(text):
+    """Return the distinct folded word tokens of text, in order."""
+    return _tokens(fold(text))
+
+
+def max_distance(token):
+    """Edit distance tolerated for a query token of this length."""
+    if len(token) <= 2:
+        return 0
+    return 1 if len(token) <= 5 else 2
+
+
+def bounded_levenshtein(a, b, bound, transpositions=False):
+    """Return the edit distance between a and b, or bound + 1 if it exceeds bound.
+
+    With ``transpositions`` swapping two adjacent characters counts as one
+    edit (optimal string alignment distance), which suits typing errors.
+    """
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        best = i
+        for j, other in enumerate(b, 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other))
+            if (transpositions and before is not None and j > 1
+                    and char == b[j - 2] and a[i - 2] == other and value > before[j - 2] + 1):
+                value = before[j - 2] + 1
+            current.append(value)
+            if value < best:
+                best = value
+        if best > bound:
+            return bound + 1
+        before, previous = previous, current
+    return previous[-1] if previous[-1] <= bound else bound + 1
+
+
+def typo_distance(a, b, bound):
+    return bounded_levenshtein(a, b, bound, transpositions=True)
+
+
+class BKTree:
+    """Burkhard-Keller tree of words under edit distance; insert-only."""
+
+    def __init__(self):
+        self._root = None
+
+    def add(self, word):
+        if self._root is None:
+            self._root = (word, {})
+            return
+        node = self._root
+        while True:
+            distance = bounded_levenshtein(word, node[0], len(word) + len(node[0]))
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                return
+            node = child
+
+    def search(self, word, bound):
+        """Return (distance, word) pairs within bound of word."""
+        if self._root is None:
+            return []
+        found = []
+        stack = [self._root]
+        while stack:
+            candidate, children = stack.pop()
+            distance = bounded_levenshtein(word, candidate, len(word) + len(candidate))
+            if distance <= bound:
+                found.append((distance, candidate))
+            for edge, child in children.items():
+                if distance - bound <= edge <= distance + bound:
+                    stack.append(child)
+        return found
+
+
+def score_tokens(query_token, tokens):
+    """Return {token: score} for the tokens that query_token matches."""
+    scores = {}
+    bound = max_distance(query_token)
+    for token in tokens:
+        if token == query_token:
+            scores[token] = 1.0
+        elif token.startswith(query_token):
+            scores[token] = 0.5 + 0.5 * len(query_token) / len(token)
+        elif bound:
+            distance = typo_distance(query_token, token, bound)
+            if distance <= bound:
+                scores[token] = 0.5 * (1 - distance / (bound + 1))
+    return scores
+
+
+class TokenIndex(StoreObserver):
+    """Token -> sorted rows postings with a sorted vocabulary and a BK-tree."""
+
+    def __init__(self):
+        self._postings = {}
+        self._vocabulary = []
+        self._tree = BKTree()
+
+    def _add(self, folded, row):
+        postings = self._postings
+        for token in _tokens(folded):
+            rows = postings.get(token)
+            if rows is None:
+                rows = postings[token] = array("I")
+                insort(self._vocabulary, token)
+                self._tree.add(token)
+            if not rows or rows[-1] < row:
+                rows.append(row)
+            else:
+                insort(rows, row)
+
+    def _discard(self, folded, row):
+        postings = self._postings
+        for token in _tokens(folded):
+            rows = postings[token]
+            del rows[bisect_left(rows, row)]
+            if not rows:
+                # The BK-tree keeps the word; lookups skip tokens without postings
+                del postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def rebuild(self, store):
+        self._postings = {}
+        self._vocabulary = []
+        self._tree = BKTree()
+        for row, folded in enumerate(store.folded_names):
+            self._add(folded, row)
+
+    def row_added(self, store, row):
+        self._add(store.folded_names[row], row)
+
+    def row_changed(self, store, row, field, old, new):
+        if field == "name":
+            self._discard(fold(old), row)
+            self._add(store.folded_names[row], row)
+
+    def rows_changed(self, store, rows, field, old, new):
+        if field == "name":
+            super().rows_changed(store, rows, field, old, new)
+
+    def row_removed(self, store, row):
+        self._discard(store.folded_names[row], row)
+
+    def row_moved(self, store, old_row, new_row):
+        folded = store.folded_names[new_row]
+        self._discard(folded, old_row)
+        self._add(folded, new_row)
+
+    def matches(self, query_token):
+        """Return {token: score} over the vocabulary for one query token."""
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, query_token)
+        end = bisect_right(vocabulary, query_token + _MAX_CHAR, start)
+        scores = score_tokens(query_token, vocabulary[start:end])
+        bound = max_distance(query_token)
+        if bound:
+            # The tree works in plain edit distance, where a transposition
+            # costs two, so search twice as wide and re-check each candidate
+            for _, token in self._tree.search(query_token, 2 * bound):
+                if token in self._postings and token not in scores:
+                    distance = typo_distance(query_token, token, bound)
+                    if distance <= bound:
+                        scores[token] = 0.5 * (1 - distance / (bound + 1))
+        return scores
+
+    def rows(self, tokens):
+        """Yield the rows containing any of tokens, in row order without repeats."""
+        previous = None
+        for row in heapq.merge(*(self._postings[token] for token in tokens)):
+            if row != previous:
+                yield row
+                previous = row
+
+    def total_rows(self, tokens):
+        return sum(len(self._postings[token]) for token in tokens)
+
+
+def _row_score(folded, per_query):
+    tokens = _tokens(folded)
+    total = 0.0
+    for scores in per_query:
+        best = max((scores.get(token, 0.0) for token in tokens), default=0.0)
+        if not best:
+            return 0.0
+        total += best
+    return total
+
+
+def ranked_rows(store, term, k):
+    """Return the top k (score, row) pairs for term, best first."""
+    query = tokenize(term)
+    if not query or k <= 0:
+        return []
+    index = store.token_index
+    folded_names = store.folded_names
+    if index is None:
+        vocabulary = {token for folded in folded_names for token in _tokens(folded)}
+        per_query = [score_tokens(token, vocabulary) for token in query]
+        candidates = range(len(folded_names))
+    else:
+        per_query = [index.matches(token) for token in query]
+        if not all(per_query):
+            return []
+        driver = min(per_query, key=lambda scores: index.total_rows(scores))
+        candidates = index.rows(driver)
+    if not all(per_query):
+        return []
+    best_possible = sum(max(scores.values()) for scores in per_query)
+    heap = []
+    scanned = 0
+    for row in candidates:
+        scanned += 1
+        score = _row_score(folded_names[row], per_query)
+        if not score:
+            continue
+        # Heap of the k best so far; (score, -row) makes earlier rows win ties
+        entry = (score, -row)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+        if len(heap) == k and heap[0][0] >= best_possible:
+            break
+    store.rows_scanned += scanned
+    return [(score, -negative_row) for score, negative_row in sorted(heap, reverse=True)]
@@ -0,0 +1,424 @@
+"""Secondary indexes kept in step with an InventoryStore."""
+import math
+import operator
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right, insort
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_ROW_BITS = 32
+_ROW_MASK = (1 << _ROW_BITS) - 1
+
+
+def fold(text):
+    """Return text case-folded and NFKC-normalized for caseless matching.
+
+    "Straße" folds to "strasse", full-width and other compatibility
+    characters to their plain forms and decomposed accents to composed
+    ones, so equal-looking text matches. ASCII text takes a fast path,
+    where folding is just lower-casing. Anything but a string raises
+    TypeError.
+    """
+    if not isinstance(text, str):
+        raise TypeError("Expected a string, got %s" % type(text).__name__)
+    if text.isascii():
+        return text.lower()
+    # NFKC can expose capitals ("\u210c" -> "H") and case folding can leave
+    # text denormalized, so normalize on both sides of the fold
+    return unicodedata.normalize("NFKC", unicodedata.normalize("NFKC", text).casefold())
+
+
+class StoreObserver:
+    """Base class for structures that follow every mutation of a store.
+
+    The store calls ``rebuild`` when the observer is attached and after bulk
+    loads, and the ``row_*`` hooks on single-row mutations. ``row_removed``
+    runs while the row's values are still readable; ``row_moved`` runs after
+    the last row has been moved into the gap left by a removal.
+    ``rows_changed`` reports one field changing on many distinct rows at once;
+    by default it calls ``row_changed`` per row, and observers override it to
+    update in a single step.
+    """
+
+    def rebuild(self, store):
+        pass
+
+    def row_added(self, store, row):
+        pass
+
+    def row_changed(self, store, row, field, old, new):
+        pass
+
+    def rows_changed(self, store, rows, field, old, new):
+        for row, old_value, new_value in zip(rows, old, new):
+            self.row_changed(store, row, field, old_value, new_value)
+
+    def row_removed(self, store, row):
+        pass
+
+    def row_moved(self, store, old_row, new_row):
+        pass
+
+
+class IdIndex(StoreObserver):
+    """Hash index from product id to row number."""
+
+    def __init__(self):
+        self._rows = {}
+
+    def rebuild(self, store):
+        rows = {}
+        for row, product_id in enumerate(store.product_ids):
+            if product_id in rows:
+                raise ValueError("Duplicate product id: %r" % product_id)
+            rows[product_id] = row
+        self._rows = rows
+
+    def row_added(self, store, row):
+        self._rows[store.product_ids[row]] = row
+
+    def row_removed(self, store, row):
+        del self._rows[store.product_ids[row]]
+
+    def rows_changed(self, store, rows, field, old, new):
+        pass
+
+    def row_moved(self, store, old_row, new_row):
+        self._rows[store.product_ids[new_row]] = new_row
+
+    def get(self, product_id):
+        """Return the row of product_id, or None."""
+        return self._rows.get(product_id)
+
+    def __contains__(self, product_id):
+        return product_id in self._rows
+
+    def __len__(self):
+        return len(self._rows)
+
+
+class QuantityIndex(StoreObserver):
+    """Sorted (quantity, row) index answering threshold queries by bisection.
+
+    Each entry packs quantity and row into one int so the index is a flat
+    sorted list of ints and bisect compares machine-sized values.
+    """
+
+    def __init__(self):
+        self._keys = []
+
+    @staticmethod
+    def _key(quantity, row):
+        return (quantity << _ROW_BITS) | row
+
+    def rebuild(self, store):
+        key = self._key
+        self._keys = sorted(key(quantity, row) for row, quantity in enumerate(store.quantities))
+
+    def _insert(self, quantity, row):
+        insort(self._keys, self._key(quantity, row))
+
+    def _discard(self, quantity, row):
+        keys = self._keys
+        key = self._key(quantity, row)
+        pos = bisect_left(keys, key)
+        if pos < len(keys) and keys[pos] == key:
+            del keys[pos]
+
+    def row_added(self, store, row):
+        self._insert(store.quantities[row], row)
+
+    def row_changed(self, store, row, field, old, new):
+        if field == "quantity":
+            self._discard(old, row)
+            self._insert(new, row)
+
+    def rows_changed(self, store, rows, field, old, new):
+        if field != "quantity":
+            return
+        keys = self._keys
+        removed = sorted(bisect_left(keys, key) for key in map(self._key, old, rows))
+        added = sorted(map(self._key, new, rows))
+        positions = [bisect_left(keys, key) for key in added]
+        # Splice the old list once: copy the runs between changed positions,
+        # dropping stale keys and slotting new ones in where they sort
+        merged = []
+        start = 0
+        i = j = 0
+        while i < len(removed) or j < len(added):
+            if j < len(added) and (i == len(removed) or positions[j] <= removed[i]):
+                merged.extend(keys[start:positions[j]])
+                merged.append(added[j])
+                start = positions[j]
+                j += 1
+            else:
+                merged.extend(keys[start:removed[i]])
+                start = removed[i] + 1
+                i += 1
+        merged.extend(keys[start:])
+        self._keys = merged
+
+    def row_removed(self, store, row):
+        self._discard(store.quantities[row], row)
+
+    def row_moved(self, store, old_row, new_row):
+        quantity = store.quantities[new_row]
+        self._discard(quantity, old_row)
+        self._insert(quantity, new_row)
+
+    def rows_at_most(self, threshold):
+        """Return the rows with quantity <= threshold, in row order."""
+        keys = self._keys
+        end = bisect_right(keys, self._key(threshold, _ROW_MASK))
+        return sorted(key & _ROW_MASK for key in keys[:end])
+
+    def _span(self, low, high):
+        keys = self._keys
+        start = 0 if low is None else bisect_left(keys, self._key(low, 0))
+        end = len(keys) if high is None else bisect_right(keys, self._key(high, _ROW_MASK))
+        return start, max(start, end)
+
+    def count_between(self, low, high):
+        """Return how many rows have low <= quantity <= high; None leaves a side open."""
+        start, end = self._span(low, high)
+        return end - start
+
+    def rows_between(self, low, high):
+        """Return the rows with low <= quantity <= high, in quantity order."""
+        start, end = self._span(low, high)
+        return [key & _ROW_MASK for key in self._keys[start:end]]
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class NGramIndex(StoreObserver):
+    """Inverted index from folded name n-grams to the rows containing them.
+
+    Used to narrow substring searches to candidate rows; callers still run
+    the exact ``term in name`` check on each candidate. Terms shorter than
+    ``n`` cannot be narrowed and ``candidates`` returns None for them.
+    """
+
+    def __init__(self, n=3):
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        self.n = n
+        self._postings = {}
+
+    def grams(self, text):
+        n = self.n
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def _add(self, folded, row):
+        postings = self._postings
+        for gram in self.grams(folded):
+            rows = postings.get(gram)
+            if rows is None:
+                postings[gram] = {row}
+            else:
+                rows.add(row)
+
+    def _discard(self, folded, row):
+        postings = self._postings
+        for gram in self.grams(folded):
+            rows = postings.get(gram)
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    del postings[gram]
+
+    def rebuild(self, store):
+        self._postings = {}
+        for row, folded in enumerate(store.folded_names):
+            self._add(folded, row)
+
+    def row_added(self, store, row):
+        self._add(store.folded_names[row], row)
+
+    def row_changed(self, store, row, field, old, new):
+        if field == "name":
+            self._discard(fold(old), row)
+            self._add(store.folded_names[row], row)
+
+    def rows_changed(self, store, rows, field, old, new):
+        if field == "name":
+            super().rows_changed(store, rows, field, old, new)
+
+    def row_removed(self, store, row):
+        self._discard(store.folded_names[row], row)
+
+    def row_moved(self, store, old_row, new_row):
+        folded = store.folded_names[new_row]
+        self._discard(folded, old_row)
+        self._add(folded, new_row)
+
+    def estimate(self, folded_term):
+        """Return an upper bound on the candidates for folded_term, or None if unknown."""
+        grams = self.grams(folded_term)
+        if not grams:
+            return None
+        postings = self._postings
+        return min(len(postings.get(gram, ())) for gram in grams)
+
+    def candidates(self, folded_term):
+        """Return the set of rows that may contain folded_term, or None if unknown."""
+        grams = self.grams(folded_term)
+        if not grams:
+            return None
+        postings = self._postings
+        sets = []
+        for gram in grams:
+            rows = postings.get(gram)
+            if rows is None:
+                return set()
+            sets.append(rows)
+        sets.sort(key=len)
+        result = set(sets[0])
+        for rows in sets[1:]:
+            result &= rows
+            if not result:
+                break
+        return result
+
+
+def count_codes(codes):
+    """Count category codes in one pass, keeping first-seen order."""
+    counts = {}
+    for code in codes:
+        counts[code] = counts.get(code, 0) + 1
+    return counts
+
+
+class CategoryCounter(StoreObserver):
+    """Category code -> sorted rows aggregate maintained on every mutation.
+
+    Keeping each category's rows (as a sorted ``array('I')``) rather than a
+    bare count lets ``counts`` order categories by their lowest current row,
+    which is the first-seen row order ``count_codes`` produces, whatever
+    sequence of mutations led to the current rows.
+    """
+
+    def __init__(self):
+        self._rows = {}
+
+    def rebuild(self, store):
+        rows_by_code = {}
+        for row, code in enumerate(store.category_codes):
+            rows = rows_by_code.get(code)
+            if rows is None:
+                rows = rows_by_code[code] = array("I")
+            rows.append(row)
+        self._rows = rows_by_code
+
+    def _add(self, code, row):
+        rows = self._rows.get(code)
+        if rows is None:
+            self._rows[code] = array("I", [row])
+        elif rows[-1] < row:
+            rows.append(row)
+        else:
+            rows.insert(bisect_left(rows, row), row)
+
+    def _discard(self, code, row):
+        rows = self._rows[code]
+        del rows[bisect_left(rows, row)]
+        if not rows:
+            del self._rows[code]
+
+    def row_added(self, store, row):
+        self._add(store.category_codes[row], row)
+
+    def row_changed(self, store, row, field, old, new):
+        if field == "category" and old != new:
+            self._discard(store.category_code(old), row)
+            self._add(store.category_codes[row], row)
+
+    def rows_changed(self, store, rows, field, old, new):
+        if field == "category":
+            super().rows_changed(store, rows, field, old, new)
+
+    def row_removed(self, store, row):
+        self._discard(store.category_codes[row], row)
+
+    def row_moved(self, store, old_row, new_row):
+        code = store.category_codes[new_row]
+        self._discard(code, old_row)
+        self._add(code, new_row)
+
+    def counts(self):
+        """Return a code -> count mapping in first-seen row order."""
+        ordered = sorted(self._rows.items(), key=lambda item: item[1][0])
+        return {code: len(rows) for code, rows in ordered}
+
+
+def dot_product(quantities, prices):
+    """Return sum(quantities[i] * prices[i]) over two array columns.
+
+    Uses NumPy on the column buffers without copying when it is installed,
+    ``math.sumprod`` on Python 3.12+, and an exactly rounded ``math.fsum``
+    otherwise.
+    """
+    if numpy is not None and len(quantities):
+        q = numpy.frombuffer(quantities, dtype=numpy.int32)
+        p = numpy.frombuffer(prices, dtype=numpy.float64)
+        return float(numpy.dot(q, p))
+    sumprod = getattr(math, "sumprod", None)
+    if sumprod is not None:
+        return float(sumprod(quantities, prices))
+    return math.fsum(map(operator.mul, quantities, prices))
+
+
+class ValueTotal(StoreObserver):
+    """Running sum of quantity * price adjusted in place on every mutation.
+
+    Uses Neumaier compensated summation so that rounding error does not
+    accumulate over long streams of small adjustments.
+    """
+
+    def __init__(self):
+        self._sum = 0.0
+        self._compensation = 0.0
+
+    def rebuild(self, store):
+        self._sum = dot_product(store.quantities, store.prices)
+        self._compensation = 0.0
+
+    def add(self, amount):
+        total = self._sum + amount
+        if abs(self._sum) >= abs(amount):
+            self._compensation += (self._sum - total) + amount
+        else:
+            self._compensation += (amount - total) + self._sum
+        self._sum = total
+
+    def row_added(self, store, row):
+        self.add(store.quantities[row] * store.prices[row])
+
+    def row_changed(self, store, row, field, old, new):
+        if field == "quantity":
+            self.add((new - old) * store.prices[row])
+        elif field == "price":
+            self.add(store.quantities[row] * (new - old))
+
+    def rows_changed(self, store, rows, field, old, new):
+        # One exactly rounded adjustment for the whole batch
+        if field == "quantity":
+            prices = store.prices
+            self.add(math.fsum(map(operator.mul, map(operator.sub, new, old),
+                                   [prices[row] for row in rows])))
+        elif field == "price":
+            quantities = store.quantities
+            self.add(math.fsum(map(operator.mul, [quantities[row] for row in rows],
+                                   map(operator.sub, new, old))))
+
+    def row_removed(self, store, row):
+        self.add(-(store.quantities[row] * store.prices[row]))
+
+    @property
+    def value(self):
+        return self._sum + self._compensation
@@ -0,0 +1,251 @@
+"""Opt-in call counts, latency histograms and profiling for InventoryStore.
+
+Instrumentation wraps the store's query and mutation methods on the class
+while enabled and puts the original functions back when disabled, so a
+disabled instance adds no per-call cost at all. Rows scanned come from the
+store's ``rows_scanned`` counter, which the scan paths bump once per call.
+Streaming queries are timed while their rows are being produced, not just
+when the generator is created, and recorded once the stream ends or is
+abandoned.
+"""
+import cProfile
+import inspect
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from inventory.store import InventoryStore
+
+QUERIES = ("low_stock", "search", "search_ranked", "category_counts", "total_value", "valuation",
+           "iter_low_stock", "iter_search")
+MUTATIONS = ("append", "extend_columns", "set_quantity", "set_price", "rename",
+             "recategorize", "remove_row", "update", "delete", "apply_movements")
+# Upper bounds of the latency histogram buckets, in seconds
+BUCKETS = (0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0, float("inf"))
+
+
+class _Operation:
+    __slots__ = ("calls", "seconds", "rows_scanned", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.rows_scanned = 0
+        self.buckets = [0] * len(BUCKETS)
+
+
+def _label(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+class Instrumentation:
+    """Records per-operation metrics for every InventoryStore while enabled.
+
+    Only one instance may instrument a class at a time. Each wrapped method
+    is recorded on its own, so ``update`` also counts the ``set_*`` calls it
+    makes.
+    """
+
+    def __init__(self, cls=InventoryStore, operations=QUERIES + MUTATIONS, clock=time.perf_counter):
+        self.cls = cls
+        self.operations = operations
+        self.clock = clock
+        self._originals = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._profiler = None
+        self._server = None
+
+    @property
+    def enabled(self):
+        return bool(self._originals)
+
+    @property
+    def profiling(self):
+        return self._profiler is not None
+
+    def _wrap(self, name, func):
+        record = self.record
+        clock = self.clock
+
+        if inspect.isgeneratorfunction(func):
+            @wraps(func)
+            def stream(store, *args, **kwargs):
+                scanned = store.rows_scanned
+                seconds = 0.0
+                rows = func(store, *args, **kwargs)
+                try:
+                    while True:
+                        start = clock()
+                        try:
+                            row = next(rows)
+                        except StopIteration:
+                            return
+                        finally:
+                            seconds += clock() - start
+                        yield row
+                finally:
+                    rows.close()
+                    record(name, seconds, store.rows_scanned - scanned)
+            return stream
+
+        @wraps(func)
+        def wrapper(store, *args, **kwargs):
+            scanned = store.rows_scanned
+            start = clock()
+            try:
+                return func(store, *args, **kwargs)
+            finally:
+                record(name, clock() - start, store.rows_scanned - scanned)
+        return wrapper
+
+    def enable(self):
+        """Start recording by wrapping the instrumented methods."""
+        if self.enabled:
+            return
+        if getattr(self.cls, "_instrumentation", None) is not None:
+            raise RuntimeError("%s is already instrumented" % self.cls.__name__)
+        for name in self.operations:
+            func = self.cls.__dict__[name]
+            self._originals[name] = func
+            setattr(self.cls, name, self._wrap(name, func))
+        self.cls._instrumentation = self
+
+    def disable(self):
+        """Stop recording and restore the original methods; metrics are kept."""
+        for name, func in self._originals.items():
+            setattr(self.cls, name, func)
+        self._originals = {}
+        if getattr(self.cls, "_instrumentation", None) is self:
+            self.cls._instrumentation = None
+
+    def record(self, name, seconds, rows_scanned=0):
+        with self._lock:
+            operation = self._stats.get(name)
+            if operation is None:
+                operation = self._stats[name] = _Operation()
+            operation.calls += 1
+            operation.seconds += seconds
+            operation.rows_scanned += rows_scanned
+            operation.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def snapshot(self):
+        """Return {operation: {calls, seconds, rows_scanned, buckets}} with cumulative buckets."""
+        with self._lock:
+            result = {}
+            for name, operation in self._stats.items():
+                cumulative = []
+                total = 0
+                for count in operation.buckets:
+                    total += count
+                    cumulative.append(total)
+                result[name] = {
+                    "calls": operation.calls,
+                    "seconds": operation.seconds,
+                    "rows_scanned": operation.rows_scanned,
+                    "buckets": dict(zip(map(_label, BUCKETS), cumulative)),
+                }
+            return result
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP inventory_operation_seconds Latency of inventory operations.",
+            "# TYPE inventory_operation_seconds histogram",
+        ]
+        stats = self.snapshot()
+        for name, operation in sorted(stats.items()):
+            for bound, count in operation["buckets"].items():
+                lines.append('inventory_operation_seconds_bucket{operation="%s",le="%s"} %d'
+                             % (name, bound, count))
+            lines.append('inventory_operation_seconds_sum{operation="%s"} %r' % (name, operation["seconds"]))
+            lines.append('inventory_operation_seconds_count{operation="%s"} %d' % (name, operation["calls"]))
+        lines.append("# HELP inventory_rows_scanned_total Rows examined by inventory operations.")
+        lines.append("# TYPE inventory_rows_scanned_total counter")
+        for name, operation in sorted(stats.items()):
+            lines.append('inventory_rows_scanned_total{operation="%s"} %d' % (name, operation["rows_scanned"]))
+        return "\n".join(lines) + "\n"
+
+    def write(self, path, fmt=None):
+        """Write the metrics to path as Prometheus text, or JSON for a .json path."""
+        if fmt is None:
+            fmt = "json" if path.endswith(".json") else "prometheus"
+        text = self.to_json() if fmt == "json" else self.to_prometheus()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp_path, path)
+
+    def serve(self, host="127.0.0.1", port=9464):
+        """Serve /metrics (Prometheus text) and /metrics.json from a background thread."""
+        instrumentation = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = instrumentation.to_prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = instrumentation.to_json(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.stop_serving()
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address
+
+    def stop_serving(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def start_profile(self):
+        """Start a cProfile capture of the calling thread."""
+        if self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop_profile(self, path=None, limit=15):
+        """Stop the capture; dump it to path if given and return the top entries as text."""
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return ""
+        profiler.disable()
+        if path is not None:
+            profiler.dump_stats(path)
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(limit)
+        return output.getvalue()
+
+    def summary_lines(self):
+        """Return one display line per recorded operation."""
+        lines = []
+        for name, operation in sorted(self.snapshot().items()):
+            mean = operation["seconds"] / operation["calls"] * 1000
+            lines.append("  %s: %d calls, %.3f ms mean, %d rows scanned"
+                         % (name, operation["calls"], mean, operation["rows_scanned"]))
+        return lines
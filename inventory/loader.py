@@ -0,0 +1,227 @@
+"""Streaming bulk loader for CSV and JSONL inventory files.
+
+Rows are parsed and validated one at a time and appended to the store in
+fixed-size chunks, so memory stays bounded by ``chunk_size`` regardless of
+the file size. Invalid rows are collected as ``RowError`` entries instead of
+aborting the load; ``RowError.row`` is the 1-based record number (the CSV
+header is not counted, and for JSONL it is the line number).
+
+Throughput target: 1,000,000 CSV rows in under 5 seconds on CPython 3.11 on
+a single core, including the rebuild of the quantity, category and value
+indexes (the benchmark suite's ``load`` case checks this).
+"""
+import csv
+import gc
+import json
+import math
+import os
+from collections import namedtuple
+from itertools import islice
+
+FIELDS = ("product_id", "name", "category", "quantity", "price")
+QUANTITY_MAX = 2 ** 31 - 1
+
+RowError = namedtuple("RowError", "row message")
+
+
+class LoadReport:
+    """Outcome of a bulk load: rows added plus the rejected rows."""
+
+    def __init__(self, max_errors):
+        self.rows_loaded = 0
+        self.error_count = 0
+        self.errors = []
+        self.max_errors = max_errors
+
+    def add_error(self, row, message):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(RowError(row, message))
+
+    def __repr__(self):
+        return "LoadReport(rows_loaded=%d, error_count=%d)" % (self.rows_loaded, self.error_count)
+
+
+def parse_row(product_id, name, category, quantity, price):
+    """Validate one row and return it with typed quantity and price.
+
+    Raises ValueError with a readable message when the row is invalid.
+    """
+    if not product_id:
+        raise ValueError("missing product_id")
+    if not name:
+        raise ValueError("missing name")
+    if not category:
+        raise ValueError("missing category")
+    if isinstance(quantity, bool) or (isinstance(quantity, float) and not quantity.is_integer()):
+        raise ValueError("quantity must be an integer: %r" % (quantity,))
+    try:
+        quantity = int(quantity)
+    except (TypeError, ValueError):
+        raise ValueError("quantity must be an integer: %r" % (quantity,))
+    if quantity < 0 or quantity > QUANTITY_MAX:
+        raise ValueError("quantity out of range: %d" % quantity)
+    if isinstance(price, bool):
+        raise ValueError("price must be a number")
+    try:
+        price = float(price)
+    except (TypeError, ValueError):
+        raise ValueError("price must be a number: %r" % (price,))
+    if not math.isfinite(price) or price < 0:
+        raise ValueError("price out of range: %r" % price)
+    return str(product_id), str(name), str(category), quantity, price
+
+
+def _as_columns(rows):
+    if not rows:
+        return ((), (), (), (), ())
+    return tuple(zip(*rows))
+
+
+def _drop_duplicate_ids(store, numbers, columns, report):
+    """Drop rows whose id is already in the store's id index or earlier in the chunk."""
+    id_index = store.id_index
+    seen = set()
+    keep = []
+    for position, product_id in enumerate(columns[0]):
+        if product_id in id_index or product_id in seen:
+            report.add_error(numbers[position], "duplicate product_id: %r" % product_id)
+        else:
+            seen.add(product_id)
+            keep.append(position)
+    if len(keep) == len(columns[0]):
+        return columns
+    return tuple([column[position] for position in keep] for column in columns)
+
+
+def _validate_columns(records):
+    """Validate a chunk of CSV records column by column.
+
+    Returns the typed columns, or None when any record in the chunk is invalid
+    and the chunk has to be parsed row by row to pinpoint the errors.
+    """
+    if min(map(len, records)) < len(FIELDS):
+        return None
+    product_ids, names, categories, quantities, prices = islice(zip(*records), len(FIELDS))
+    if not (all(product_ids) and all(names) and all(categories)):
+        return None
+    try:
+        quantities = [int(quantity) for quantity in quantities]
+        prices = [float(price) for price in prices]
+    except ValueError:
+        return None
+    if (min(quantities) < 0 or max(quantities) > QUANTITY_MAX or
+            min(prices) < 0 or not all(map(math.isfinite, prices))):
+        return None
+    return product_ids, names, categories, quantities, prices
+
+
+def _csv_chunks(handle, report, chunk_size):
+    reader = csv.reader(handle)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [column.strip().lower() for column in header]
+    missing = [field for field in FIELDS if field not in header]
+    if missing:
+        raise ValueError("CSV header is missing columns: %s" % ", ".join(missing))
+    positions = [header.index(field) for field in FIELDS]
+    in_order = positions == list(range(len(FIELDS)))
+    first = 1
+    while True:
+        records = list(islice(reader, chunk_size))
+        if not records:
+            return
+        columns = _validate_columns(records) if in_order else None
+        if columns is None:
+            numbers = []
+            rows = []
+            for number, record in enumerate(records, first):
+                if not record:
+                    continue
+                try:
+                    rows.append(parse_row(*[record[position] for position in positions]))
+                except IndexError:
+                    report.add_error(number, "expected %d columns, got %d" % (len(header), len(record)))
+                    continue
+                except ValueError as e:
+                    report.add_error(number, str(e))
+                    continue
+                numbers.append(number)
+            columns = _as_columns(rows)
+        else:
+            numbers = range(first, first + len(records))
+        first += len(records)
+        yield numbers, columns
+
+
+def _jsonl_chunks(handle, report, chunk_size):
+    numbers = []
+    rows = []
+    for number, text in enumerate(handle, 1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as e:
+            report.add_error(number, "invalid JSON: %s" % e)
+            continue
+        if not isinstance(record, dict):
+            report.add_error(number, "expected a JSON object")
+            continue
+        try:
+            rows.append(parse_row(*[record.get(field) for field in FIELDS]))
+        except ValueError as e:
+            report.add_error(number, str(e))
+            continue
+        numbers.append(number)
+        if len(rows) >= chunk_size:
+            yield numbers, _as_columns(rows)
+            numbers = []
+            rows = []
+    if rows:
+        yield numbers, _as_columns(rows)
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError("Cannot infer inventory format from %r; pass fmt='csv' or 'jsonl'" % path)
+
+
+def load_file(path, store, fmt=None, chunk_size=50000, max_errors=1000):
+    """Stream a CSV or JSONL inventory file into store.
+
+    Indexes attached to the store are rebuilt once at the end of the load
+    instead of being updated row by row. When the store has an id index,
+    rows with an id that is already present are reported as errors.
+    Returns a LoadReport.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    fmt = fmt or detect_format(path)
+    if fmt == "csv":
+        chunks = _csv_chunks
+    elif fmt == "jsonl":
+        chunks = _jsonl_chunks
+    else:
+        raise ValueError("Unknown inventory format: %r" % fmt)
+    report = LoadReport(max_errors)
+    # Chunks hold many short-lived containers; cyclic GC passes over them
+    # would otherwise cost as much as the parsing itself.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as handle, store.bulk_load():
+            for numbers, columns in chunks(handle, report, chunk_size):
+                if store.id_index is not None:
+                    columns = _drop_duplicate_ids(store, numbers, columns, report)
+                store.extend_columns(*columns)
+                report.rows_loaded += len(columns[0])
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return report
@@ -0,0 +1,179 @@
+"""Sharded query execution over worker processes and shared memory.
+
+The columns a query needs (quantities, prices, category codes and the
+encoded folded names) are copied once into ``multiprocessing.shared_memory``
+blocks. Every worker process attaches to the same blocks, so a query is
+mapped over contiguous row ranges without pickling any column data, and the
+per-shard answers are reduced in shard order so results keep the original
+row order.
+
+A ShardedInventory answers the same four queries as an InventoryStore and
+can be passed as ``store=`` to the skeleton functions. The parent keeps no
+copy of its own: ids, names and quantities of result rows are read from the
+store, so ``refresh`` after changing the store, before querying again.
+"""
+import math
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from inventory.indexes import count_codes, fold
+from inventory.store import take
+
+_COLUMNS = (("quantities", "i"), ("prices", "d"), ("codes", "I"),
+            ("name_offsets", "Q"), ("name_heap", "B"))
+
+# Per-worker views onto the shared blocks, set by _attach
+_blocks = {}
+_views = {}
+
+
+def _attach(names):
+    """Worker initializer: map the shared blocks into this process."""
+    for column, typecode in _COLUMNS:
+        name, length = names[column]
+        # Workers share the parent's resource tracker, which already tracks
+        # these blocks; the parent unlinks them in close().
+        block = shared_memory.SharedMemory(name=name)
+        _blocks[column] = block
+        _views[column] = block.buf[:length * array(typecode).itemsize].cast(typecode)
+
+
+def _low_stock_shard(threshold, start, end):
+    quantities = _views["quantities"]
+    rows = array("I")
+    for i in range(start, end):
+        if quantities[i] <= threshold:
+            rows.append(i)
+    return rows.tobytes()
+
+
+def _search_shard(term, start, end):
+    offsets = _views["name_offsets"]
+    heap = _views["name_heap"]
+    rows = array("I")
+    for i in range(start, end):
+        if term in str(heap[offsets[i]:offsets[i + 1]], "utf-8"):
+            rows.append(i)
+    return rows.tobytes()
+
+
+def _category_shard(start, end):
+    return list(count_codes(_views["codes"][start:end]).items())
+
+
+def _total_shard(start, end):
+    quantities = _views["quantities"]
+    prices = _views["prices"]
+    return math.fsum(quantities[i] * prices[i] for i in range(start, end))
+
+
+def _rows(shards):
+    rows = array("I")
+    for data in shards:
+        rows.frombytes(data)
+    return rows
+
+
+class ShardedInventory:
+    """Runs the inventory queries as map/reduce over worker processes.
+
+    ``shards`` defaults to the number of workers; use more shards than
+    workers to even out uneven shards.
+    """
+
+    def __init__(self, store, workers=None, shards=None):
+        self.store = store
+        self.workers = workers or os.cpu_count() or 1
+        self.shards = shards or self.workers
+        self._blocks = []
+        self._pool = None
+        self.refresh()
+
+    def _share(self, typecode, values):
+        data = array(typecode, values)
+        size = max(1, len(data) * data.itemsize)
+        block = shared_memory.SharedMemory(create=True, size=size)
+        self._blocks.append(block)
+        block.buf[:len(data) * data.itemsize] = data.tobytes()
+        return block.name, len(data)
+
+    def refresh(self):
+        """Copy the store's current columns into fresh shared memory and restart the workers."""
+        self._release()
+        store = self.store
+        heap = bytearray()
+        offsets = array("Q", [0])
+        # Folded here rather than through store.folded_names, which would
+        # build and keep that column on the store
+        for name in store.names:
+            heap += fold(name).encode("utf-8")
+            offsets.append(len(heap))
+        self.rows = len(store)
+        names = {
+            "quantities": self._share("i", store.quantities),
+            "prices": self._share("d", store.prices),
+            "codes": self._share("I", store.category_codes),
+            "name_offsets": self._share("Q", offsets),
+            "name_heap": self._share("B", heap),
+        }
+        self.category_names = list(store.category_names)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_attach,
+                                         initargs=(names,))
+
+    def _ranges(self):
+        step = max(1, -(-self.rows // self.shards))
+        return [(start, min(start + step, self.rows)) for start in range(0, self.rows, step)]
+
+    def _map(self, func, *args):
+        ranges = self._ranges()
+        futures = [self._pool.submit(func, *(args + bounds)) for bounds in ranges]
+        return [future.result() for future in futures]
+
+    def __len__(self):
+        return self.rows
+
+    def low_stock(self, threshold):
+        """Return (ids, names, quantities) of rows with quantity <= threshold."""
+        rows = _rows(self._map(_low_stock_shard, threshold))
+        store = self.store
+        quantities = store.quantities
+        return (take(store.product_ids, rows), take(store.names, rows),
+                [quantities[i] for i in rows])
+
+    def search(self, term):
+        """Return (ids, names) of rows whose name contains term, ignoring case."""
+        rows = _rows(self._map(_search_shard, fold(term)))
+        return take(self.store.product_ids, rows), take(self.store.names, rows)
+
+    def category_counts(self):
+        """Return (unique_categories, counts) in first-seen order."""
+        counts = {}
+        for shard in self._map(_category_shard):
+            for code, count in shard:
+                counts[code] = counts.get(code, 0) + count
+        return [self.category_names[code] for code in counts], list(counts.values())
+
+    def total_value(self):
+        """Return the sum of quantity * price over all rows."""
+        return math.fsum(self._map(_total_shard))
+
+    def _release(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def close(self):
+        """Stop the workers and free the shared memory."""
+        self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,208 @@
+"""Compact binary snapshot format that can be opened with mmap.
+
+Layout (native byte order, every section 8-byte aligned)::
+
+    header       magic, byte-order mark, version, row and category counts,
+                 and the file offset of each section below
+    quantities   int32[rows]
+    prices       float64[rows]
+    categories   uint32[rows]                 category code per row
+    id_offsets   uint64[rows + 1]             into the string heap
+    name_offsets uint64[rows + 1]
+    cat_offsets  uint64[categories + 1]
+    heap         UTF-8 bytes of every id, name and category name
+
+``open_snapshot`` maps the file and exposes these sections directly as the
+store's columns, so opening costs the same regardless of the row count and
+queries read straight from the page cache.
+"""
+import mmap
+import os
+import struct
+from array import array
+
+from inventory.store import InventoryStore
+
+MAGIC = b"INVSNAP\x01"
+VERSION = 1
+BYTE_ORDER_MARK = 0x0102
+_SECTIONS = ("quantities", "prices", "categories", "id_offsets", "name_offsets",
+             "cat_offsets", "heap")
+_HEADER = struct.Struct("=8sHHIQQ" + "Q" * len(_SECTIONS))
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a readable inventory snapshot."""
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _string_offsets(strings, heap, start):
+    """Append strings to heap and return their uint64 offset column."""
+    offsets = array("Q", [start])
+    position = start
+    for text in strings:
+        data = text.encode("utf-8")
+        heap.append(data)
+        position += len(data)
+        offsets.append(position)
+    return offsets, position
+
+
+def write_snapshot(store, path):
+    """Write the store to path atomically in snapshot format."""
+    rows = len(store)
+    heap = []
+    id_offsets, end = _string_offsets(store.product_ids, heap, 0)
+    name_offsets, end = _string_offsets(store.names, heap, end)
+    cat_offsets, end = _string_offsets(store.category_names, heap, end)
+    sections = [
+        array("i", store.quantities),
+        array("d", store.prices),
+        array("I", store.category_codes),
+        id_offsets,
+        name_offsets,
+        cat_offsets,
+    ]
+    offsets = []
+    position = _align(_HEADER.size)
+    for section in sections:
+        offsets.append(position)
+        position = _align(position + len(section) * section.itemsize)
+    offsets.append(position)
+    header = _HEADER.pack(MAGIC, BYTE_ORDER_MARK, VERSION, 0, rows,
+                          len(store.category_names), *offsets)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as handle:
+        handle.write(header)
+        for offset, section in zip(offsets, sections):
+            handle.write(b"\0" * (offset - handle.tell()))
+            section.tofile(handle)
+        handle.write(b"\0" * (offsets[-1] - handle.tell()))
+        for data in heap:
+            handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temp_path, path)
+
+
+class StringColumn:
+    """Read-only sequence of strings decoded on access from a mapped heap."""
+
+    __slots__ = ("_heap", "_offsets")
+
+    def __init__(self, heap, offsets):
+        self._heap = heap
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("Row out of range")
+        return str(self._heap[self._offsets[row]:self._offsets[row + 1]], "utf-8")
+
+    def __iter__(self):
+        heap = self._heap
+        offsets = self._offsets
+        start = offsets[0]
+        for i in range(1, len(offsets)):
+            end = offsets[i]
+            yield str(heap[start:end], "utf-8")
+            start = end
+
+    def take(self, rows):
+        """Return the strings at rows, in the order given, as a list."""
+        heap = self._heap
+        offsets = self._offsets
+        return [str(heap[offsets[row]:offsets[row + 1]], "utf-8") for row in rows]
+
+
+class SnapshotStore(InventoryStore):
+    """Read-only InventoryStore whose columns are views into a mapped snapshot.
+
+    Indexes can still be attached (they are built in memory), and the
+    folded name column is built in memory the first time it is read. Call
+    ``close`` or use the store as a context manager to unmap the file.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        with open(path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size < _HEADER.size:
+                raise SnapshotError("%s is too short to be a snapshot" % path)
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._views = []
+            self._open()
+        except Exception:
+            self.close()
+            raise
+
+    def _view(self, start, end, fmt):
+        view = self._buffer[start:end].cast(fmt)
+        self._views.append(view)
+        return view
+
+    def _open(self):
+        fields = _HEADER.unpack_from(self._map, 0)
+        magic, mark, version, _, rows, category_count = fields[:6]
+        offsets = fields[6:]
+        if magic != MAGIC:
+            raise SnapshotError("%s is not an inventory snapshot" % self.path)
+        if mark != BYTE_ORDER_MARK:
+            raise SnapshotError("%s was written on a machine with a different byte order" % self.path)
+        if version != VERSION:
+            raise SnapshotError("Unsupported snapshot version %d" % version)
+        if offsets[-1] > len(self._map):
+            raise SnapshotError("%s is truncated" % self.path)
+        self._buffer = memoryview(self._map)
+        self._views.append(self._buffer)
+        q, p, c, ids, names, cats, heap = offsets
+        self.quantities = self._view(q, q + 4 * rows, "i")
+        self.prices = self._view(p, p + 8 * rows, "d")
+        self.category_codes = self._view(c, c + 4 * rows, "I")
+        heap_view = self._buffer[heap:]
+        self._views.append(heap_view)
+        self.product_ids = StringColumn(heap_view, self._view(ids, ids + 8 * (rows + 1), "Q"))
+        self.names = StringColumn(heap_view, self._view(names, names + 8 * (rows + 1), "Q"))
+        self.category_names = list(StringColumn(
+            heap_view, self._view(cats, cats + 8 * (category_count + 1), "Q")))
+        self._category_lookup = {name: code for code, name in enumerate(self.category_names)}
+
+    def close(self):
+        """Release every view and unmap the file."""
+        for view in reversed(getattr(self, "_views", ())):
+            view.release()
+        self._views = []
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Snapshot-backed inventory is read-only; copy it with to_store()")
+
+    append = extend = extend_columns = _read_only
+    set_quantity = set_price = rename = recategorize = remove_row = apply_movements = _read_only
+
+    def to_store(self):
+        """Copy the snapshot into a regular, writable InventoryStore."""
+        return InventoryStore.from_lists(list(self.product_ids), list(self.names),
+                                         list(self.categories), self.quantities, self.prices)
+
+
+def open_snapshot(path):
+    """Map a snapshot file and return a read-only SnapshotStore."""
+    return SnapshotStore(path)
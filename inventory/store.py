@@ -0,0 +1,781 @@
+"""Columnar, array-backed storage for the inventory."""
+import operator
+from array import array
+from contextlib import contextmanager
+from itertools import accumulate
+
+from inventory import filters
+from inventory.alerts import LowStockAlerts
+from inventory.cache import QueryCache
+from inventory.fuzzy import TokenIndex, ranked_rows
+from inventory.indexes import (CategoryCounter, IdIndex, NGramIndex, QuantityIndex, ValueTotal,
+                               count_codes, dot_product, fold)
+from inventory.loader import QUANTITY_MAX
+from inventory.valuation import PriceBands, valuate
+
+
+class CategoryColumn:
+    """Read-only sequence view that decodes the category code column."""
+
+    __slots__ = ("_store",)
+
+    def __init__(self, store):
+        self._store = store
+
+    def __len__(self):
+        return len(self._store.category_codes)
+
+    def __getitem__(self, row):
+        table = self._store.category_names
+        if isinstance(row, slice):
+            return [table[code] for code in self._store.category_codes[row]]
+        return table[self._store.category_codes[row]]
+
+    def __iter__(self):
+        table = self._store.category_names
+        for code in self._store.category_codes:
+            yield table[code]
+
+
+def _check_text(text):
+    if not isinstance(text, str):
+        raise TypeError("Expected a string, got %s" % type(text).__name__)
+    return text
+
+
+def _check_strings(strings):
+    strings = list(strings)
+    # join rejects the first non-string
+    "".join(strings)
+    return strings
+
+
+def _encode(text):
+    return _check_text(text).encode("utf-8")
+
+
+def take(column, rows):
+    """Return column[row] for each of rows, in the order given, as a list.
+
+    Lists are indexed directly; packed string columns (StringHeap, or a
+    snapshot's StringColumn) decode just those rows.
+    """
+    if isinstance(column, list):
+        return list(map(column.__getitem__, rows))
+    return column.take(rows)
+
+
+class StringHeap:
+    """Mutable sequence of strings packed as UTF-8 into one bytearray.
+
+    Each row keeps a start and an end offset into the heap, 16 bytes in
+    all, instead of a pointer to its own str object (about 50 bytes of
+    object header on top of the text). Strings are decoded on access.
+    A rename that does not fit in place appends its bytes, and swap-remove
+    only moves offsets, so superseded bytes become garbage. The heap is
+    compacted once garbage outweighs the live bytes.
+    """
+
+    __slots__ = ("_heap", "_starts", "_ends", "_garbage")
+
+    def __init__(self, strings=()):
+        self._heap = bytearray()
+        self._starts = array("Q")
+        self._ends = array("Q")
+        self._garbage = 0
+        self.extend(strings)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        return self._heap[self._starts[row]:self._ends[row]].decode("utf-8")
+
+    def __iter__(self):
+        heap = self._heap
+        for start, end in zip(self._starts, self._ends):
+            yield heap[start:end].decode("utf-8")
+
+    def __eq__(self, other):
+        if not isinstance(other, (StringHeap, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(map(operator.eq, self, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "StringHeap(%r)" % list(self)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the heap and the offset columns."""
+        return len(self._heap) + (len(self._starts) + len(self._ends)) * 8
+
+    def append(self, text):
+        data = _encode(text)
+        heap = self._heap
+        self._starts.append(len(heap))
+        heap += data
+        self._ends.append(len(heap))
+
+    def extend(self, strings):
+        strings = list(strings)
+        # Encoded in one piece (join rejects non-strings before anything changes);
+        # for ASCII text the byte lengths are the string lengths
+        text = "".join(strings)
+        data = text.encode("utf-8")
+        if len(data) == len(text):
+            lengths = map(len, strings)
+        else:
+            lengths = [len(text.encode("utf-8")) for text in strings]
+        bounds = array("Q", accumulate(lengths, initial=len(self._heap)))
+        self._heap += data
+        self._starts.extend(bounds[:-1])
+        self._ends.extend(bounds[1:])
+
+    def take(self, rows):
+        """Return the strings at rows, in the order given, as a list."""
+        heap, starts, ends = self._heap, self._starts, self._ends
+        return [heap[starts[row]:ends[row]].decode("utf-8") for row in rows]
+
+    def index(self, text):
+        """Return the lowest row holding text; raises ValueError if there is none.
+
+        Compares each row's bytes in place rather than decoding every row.
+        """
+        data = _encode(text)
+        heap, size = self._heap, len(data)
+        for row, (start, end) in enumerate(zip(self._starts, self._ends)):
+            if end - start == size and heap[start:end] == data:
+                return row
+        raise ValueError("%r is not in the column" % text)
+
+    def __setitem__(self, row, text):
+        data = _encode(text)
+        start, end = self._starts[row], self._ends[row]
+        if len(data) <= end - start:
+            self._heap[start:start + len(data)] = data
+            self._ends[row] = start + len(data)
+            self._garbage += end - start - len(data)
+        else:
+            heap = self._heap
+            self._starts[row] = len(heap)
+            heap += data
+            self._ends[row] = len(heap)
+            self._garbage += end - start
+        self._maybe_compact()
+
+    def swap_remove(self, row):
+        """Remove row, moving the last string into its place by offsets alone."""
+        start, end = self._starts[row], self._ends[row]
+        self._starts[row] = self._starts[-1]
+        self._ends[row] = self._ends[-1]
+        self._starts.pop()
+        self._ends.pop()
+        if end == len(self._heap):
+            del self._heap[start:]
+        else:
+            self._garbage += end - start
+            self._maybe_compact()
+
+    def _maybe_compact(self):
+        if self._garbage > 4096 and 2 * self._garbage > len(self._heap):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the heap in row order without garbage."""
+        heap = self._heap
+        parts = [heap[start:end] for start, end in zip(self._starts, self._ends)]
+        bounds = array("Q", accumulate(map(len, parts), initial=0))
+        self._heap = bytearray().join(parts)
+        self._starts = bounds[:-1]
+        self._ends = bounds[1:]
+        self._garbage = 0
+
+
+class Product:
+    """View of one row that reads its fields from the store's columns.
+
+    Holds only the store and a row number, so a view has no per-instance
+    dict and copies nothing. Assigning quantity, price, name or category goes
+    through the store, keeping its indexes in step. A view follows a row
+    position: after a swap-remove it may show a different product.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+    @property
+    def row(self):
+        return self._row
+
+    @property
+    def product_id(self):
+        return self._store.product_ids[self._row]
+
+    @property
+    def name(self):
+        return self._store.names[self._row]
+
+    @name.setter
+    def name(self, value):
+        self._store.rename(self._row, value)
+
+    @property
+    def category(self):
+        return self._store.categories[self._row]
+
+    @category.setter
+    def category(self, value):
+        self._store.recategorize(self._row, value)
+
+    @property
+    def quantity(self):
+        return self._store.quantities[self._row]
+
+    @quantity.setter
+    def quantity(self, value):
+        self._store.set_quantity(self._row, value)
+
+    @property
+    def price(self):
+        return self._store.prices[self._row]
+
+    @price.setter
+    def price(self, value):
+        self._store.set_price(self._row, value)
+
+    @property
+    def value(self):
+        return self._store.quantities[self._row] * self._store.prices[self._row]
+
+    def as_tuple(self):
+        """Return the (product_id, name, category, quantity, price) tuple."""
+        return self._store.row(self._row)
+
+    def __eq__(self, other):
+        if not isinstance(other, Product):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "Product(%r, %r, %r, %r, %r)" % self.as_tuple()
+
+
+class InventoryStore:
+    """Inventory held as typed, contiguous columns.
+
+    Quantities and prices live in ``array`` columns instead of lists of boxed
+    Python objects, and every distinct category string is stored once and
+    referenced from the rows by a small integer code. Product ids and names
+    are lists of str; ``packed=True`` packs them into StringHeap columns
+    instead, which hold a fraction of the memory but decode every
+    string they return, so queries returning many rows run slower.
+    ``folded_names`` shadows ``names`` with each name passed through
+    ``fold``, so caseless searches never re-fold the stored names. It is
+    built the first time it is read (by a search, a name filter or a name
+    index) and kept in step from then on; a store that is never searched
+    by name does not pay for it.
+    """
+
+    def __init__(self, packed=False):
+        string_column = StringHeap if packed else list
+        self.product_ids = string_column()
+        self.names = string_column()
+        self._folded_names = None
+        self.category_codes = array("I")
+        self.category_names = []
+        self._category_lookup = {}
+        self.quantities = array("i")
+        self.prices = array("d")
+        self.categories = CategoryColumn(self)
+        self.id_index = None
+        self.quantity_index = None
+        self.name_index = None
+        self.token_index = None
+        self.category_counter = None
+        self.value_total = None
+        self.query_cache = None
+        self.low_stock_alerts = None
+        # Bumped on every mutation; lets caches detect changes they missed
+        self.generation = 0
+        # Rows examined by queries and id lookups, read by instrumentation
+        self.rows_scanned = 0
+        self._observers = []
+
+    @classmethod
+    def from_lists(cls, product_ids, names, categories, quantities, prices, packed=False):
+        """Build a store from five parallel lists."""
+        store = cls(packed=packed)
+        store.extend_columns(product_ids, names, categories, quantities, prices)
+        return store
+
+    def __len__(self):
+        return len(self.product_ids)
+
+    @property
+    def folded_names(self):
+        if self._folded_names is None:
+            self._folded_names = list(map(fold, self.names))
+        return self._folded_names
+
+    @folded_names.setter
+    def folded_names(self, value):
+        self._folded_names = value
+
+    # Observers and indexes
+
+    def attach(self, observer):
+        """Register an observer and bring it up to date with the current rows."""
+        observer.rebuild(self)
+        self._observers.append(observer)
+        return observer
+
+    def detach(self, observer):
+        self._observers.remove(observer)
+
+    def rebuild_observers(self):
+        """Recompute every attached index in one pass, e.g. after a bulk load."""
+        for observer in self._observers:
+            observer.rebuild(self)
+
+    def create_id_index(self):
+        """Maintain a product id -> row hash index and reject duplicate ids."""
+        if self.id_index is None:
+            self.id_index = self.attach(IdIndex())
+        return self.id_index
+
+    def create_quantity_index(self):
+        """Maintain a sorted quantity index used by low_stock."""
+        if self.quantity_index is None:
+            self.quantity_index = self.attach(QuantityIndex())
+        return self.quantity_index
+
+    def create_name_index(self, n=3):
+        """Maintain an n-gram index over names used to narrow search."""
+        if self.name_index is None:
+            self.name_index = self.attach(NGramIndex(n))
+        return self.name_index
+
+    def create_token_index(self):
+        """Maintain word-token postings used by search_ranked."""
+        if self.token_index is None:
+            self.token_index = self.attach(TokenIndex())
+        return self.token_index
+
+    def create_category_counter(self):
+        """Maintain per-category row counts used by category_counts."""
+        if self.category_counter is None:
+            self.category_counter = self.attach(CategoryCounter())
+        return self.category_counter
+
+    def create_value_total(self):
+        """Maintain a running quantity * price total used by total_value."""
+        if self.value_total is None:
+            self.value_total = self.attach(ValueTotal())
+        return self.value_total
+
+    def create_query_cache(self, maxsize=256, ttl=None):
+        """Cache low_stock and search results, invalidated by mutations."""
+        if self.query_cache is None:
+            self.query_cache = self.attach(QueryCache(maxsize, ttl))
+        return self.query_cache
+
+    def create_low_stock_alerts(self):
+        """Maintain threshold subscriptions notified as quantities cross them."""
+        if self.low_stock_alerts is None:
+            self.low_stock_alerts = self.attach(LowStockAlerts())
+        return self.low_stock_alerts
+
+    def _changed(self, row, field, old, new):
+        self.generation += 1
+        for observer in self._observers:
+            observer.row_changed(self, row, field, old, new)
+
+    def category_code(self, category):
+        """Return the code for a category, interning it on first use."""
+        code = self._category_lookup.get(category)
+        if code is None:
+            code = len(self.category_names)
+            self.category_names.append(category)
+            self._category_lookup[category] = code
+        return code
+
+    def row(self, row):
+        """Return one row as a (product_id, name, category, quantity, price) tuple."""
+        return (self.product_ids[row], self.names[row], self.categories[row],
+                self.quantities[row], self.prices[row])
+
+    def product(self, row):
+        """Return a Product view of one row."""
+        if not -len(self.product_ids) <= row < len(self.product_ids):
+            raise IndexError("Row out of range")
+        return Product(self, row % len(self.product_ids))
+
+    def products(self):
+        """Yield a Product view of every row, in row order."""
+        for row in range(len(self.product_ids)):
+            yield Product(self, row)
+
+    def row_of(self, product_id):
+        """Return the row holding product_id; raises KeyError if it is unknown.
+
+        O(1) with an id index, otherwise a scan of the id column.
+        """
+        if self.id_index is not None:
+            row = self.id_index.get(product_id)
+            if row is None:
+                raise KeyError(product_id)
+            return row
+        product_ids = self.product_ids
+        if isinstance(product_ids, list) or (
+                isinstance(product_ids, StringHeap) and isinstance(product_id, str)):
+            try:
+                row = product_ids.index(product_id)
+            except ValueError:
+                row = None
+        else:
+            row = next((row for row, candidate in enumerate(product_ids)
+                        if candidate == product_id), None)
+        if row is None:
+            self.rows_scanned += len(product_ids)
+            raise KeyError(product_id)
+        # Charged as the rows a front-to-back scan examines
+        self.rows_scanned += row + 1
+        return row
+
+    def get(self, product_id):
+        """Return the row tuple for product_id; raises KeyError if it is unknown."""
+        return self.row(self.row_of(product_id))
+
+    def update(self, product_id, name=None, category=None, quantity=None, price=None):
+        """Change any of a product's fields by id and return its row."""
+        row = self.row_of(product_id)
+        if quantity is not None:
+            self.set_quantity(row, quantity)
+        if price is not None:
+            self.set_price(row, price)
+        if name is not None:
+            self.rename(row, name)
+        if category is not None:
+            self.recategorize(row, category)
+        return row
+
+    def delete(self, product_id):
+        """Remove a product by id using swap-remove."""
+        self.remove_row(self.row_of(product_id))
+
+    def _check_new_ids(self, product_ids):
+        if self.id_index is None:
+            return
+        seen = set()
+        for product_id in product_ids:
+            if product_id in self.id_index or product_id in seen:
+                raise ValueError("Duplicate product id: %r" % product_id)
+            seen.add(product_id)
+
+    # Mutations
+
+    def append(self, product_id, name, category, quantity, price):
+        """Add a product and return its row number."""
+        _check_text(product_id)
+        _check_text(name)
+        self._check_new_ids((product_id,))
+        if self._folded_names is not None:
+            folded = fold(name)
+        code = self.category_code(category)
+        # Typed columns first so a bad quantity or price leaves the store untouched
+        self.quantities.append(quantity)
+        try:
+            self.prices.append(price)
+        except (TypeError, OverflowError):
+            self.quantities.pop()
+            raise
+        self.category_codes.append(code)
+        self.product_ids.append(product_id)
+        self.names.append(name)
+        if self._folded_names is not None:
+            self._folded_names.append(folded)
+        row = len(self.product_ids) - 1
+        self.generation += 1
+        for observer in self._observers:
+            observer.row_added(self, row)
+        return row
+
+    def extend(self, rows):
+        """Append many (product_id, name, category, quantity, price) rows at once."""
+        if rows:
+            self.extend_columns(*zip(*rows))
+
+    def extend_columns(self, product_ids, names, categories, quantities, prices):
+        """Append rows given as five parallel sequences."""
+        if not (len(product_ids) == len(names) == len(categories) ==
+                len(quantities) == len(prices)):
+            raise ValueError("Inventory columns must have the same length")
+        # Checked up front so a non-string id or name leaves every column unchanged
+        product_ids = _check_strings(product_ids)
+        names = _check_strings(names)
+        self._check_new_ids(product_ids)
+        if self._folded_names is not None:
+            folded = list(map(fold, names))
+        new_quantities = array("i", quantities)
+        new_prices = array("d", prices)
+        for category in dict.fromkeys(categories):
+            self.category_code(category)
+        new_codes = array("I", map(self._category_lookup.__getitem__, categories))
+        first = len(self.product_ids)
+        self.product_ids.extend(product_ids)
+        self.names.extend(names)
+        self.quantities.extend(new_quantities)
+        self.prices.extend(new_prices)
+        self.category_codes.extend(new_codes)
+        if self._folded_names is not None:
+            self._folded_names.extend(folded)
+        self.generation += 1
+        for observer in self._observers:
+            for row in range(first, len(self.product_ids)):
+                observer.row_added(self, row)
+
+    @contextmanager
+    def bulk_load(self):
+        """Suspend observers for a bulk load and rebuild them once afterwards.
+
+        The id index keeps following the rows so duplicate ids are still
+        rejected during the load.
+        """
+        observers = self._observers
+        self._observers = [observer for observer in observers if observer is self.id_index]
+        try:
+            yield self
+        finally:
+            self._observers = observers
+            self.generation += 1
+            for observer in observers:
+                if observer is not self.id_index:
+                    observer.rebuild(self)
+
+    def set_quantity(self, row, quantity):
+        old = self.quantities[row]
+        self.quantities[row] = quantity
+        self._changed(row, "quantity", old, quantity)
+
+    def set_price(self, row, price):
+        old = self.prices[row]
+        self.prices[row] = price
+        self._changed(row, "price", old, price)
+
+    def rename(self, row, name):
+        old = self.names[row]
+        _check_text(name)
+        if self._folded_names is not None:
+            folded = fold(name)
+        self.names[row] = name
+        if self._folded_names is not None:
+            self._folded_names[row] = folded
+        self._changed(row, "name", old, name)
+
+    def recategorize(self, row, category):
+        old = self.categories[row]
+        self.category_codes[row] = self.category_code(category)
+        self._changed(row, "category", old, category)
+
+    def apply_movements(self, movements):
+        """Apply (product_id, delta) stock movements as one batch.
+
+        Deltas are summed per product, every resulting quantity is checked
+        before any is written, and observers get a single ``rows_changed``
+        call, so aggregates and indexes are updated once per batch. Raises
+        KeyError for an unknown product and ValueError if a quantity would
+        leave the valid range; the store is unchanged in both cases. Returns
+        the number of products changed.
+        """
+        totals = {}
+        get = totals.get
+        for product_id, delta in movements:
+            if type(delta) is not int:
+                raise TypeError("Stock movement deltas must be integers")
+            totals[product_id] = get(product_id, 0) + delta
+        rows = list(map(self.row_of, totals))
+        quantities = self.quantities
+        old = [quantities[row] for row in rows]
+        new = list(map(operator.add, old, totals.values()))
+        if new and (min(new) < 0 or max(new) > QUANTITY_MAX):
+            for product_id, quantity in zip(totals, new):
+                if quantity < 0 or quantity > QUANTITY_MAX:
+                    raise ValueError("Quantity of %r would become %d" % (product_id, quantity))
+        for row, quantity in zip(rows, new):
+            quantities[row] = quantity
+        self.generation += 1
+        for observer in self._observers:
+            observer.rows_changed(self, rows, "quantity", old, new)
+        return len(rows)
+
+    def remove_row(self, row):
+        """Remove a row by moving the last row into its place.
+
+        Returns the previous number of the row that was moved, or None when
+        the removed row was already the last one.
+        """
+        last = len(self.product_ids) - 1
+        if row < 0 or row > last:
+            raise IndexError("Row out of range")
+        self.generation += 1
+        for observer in self._observers:
+            observer.row_removed(self, row)
+        columns = [self.category_codes, self.quantities, self.prices]
+        if self._folded_names is not None:
+            columns.append(self._folded_names)
+        for column in (self.product_ids, self.names):
+            if isinstance(column, StringHeap):
+                # Moves offsets only
+                column.swap_remove(row)
+            else:
+                columns.append(column)
+        moved = None
+        if row != last:
+            for column in columns:
+                column[row] = column[last]
+            moved = last
+        for column in columns:
+            column.pop()
+        if moved is not None:
+            for observer in self._observers:
+                observer.row_moved(self, moved, row)
+        return moved
+
+    # Queries
+
+    def low_stock(self, threshold):
+        """Return (ids, names, quantities) of rows with quantity <= threshold."""
+        if self.query_cache is not None:
+            return self.query_cache.get(self, "low_stock", threshold, self._low_stock)
+        return self._low_stock(threshold)
+
+    def _low_stock(self, threshold):
+        quantities = self.quantities
+        if self.quantity_index is not None:
+            rows = self.quantity_index.rows_at_most(threshold)
+            self.rows_scanned += len(rows)
+        else:
+            self.rows_scanned += len(quantities)
+            rows = [i for i, quantity in enumerate(quantities) if quantity <= threshold]
+        # Rows first, then one copy per column, so a packed column decodes only the hits
+        return (take(self.product_ids, rows), take(self.names, rows),
+                [quantities[i] for i in rows])
+
+    def search(self, term):
+        """Return (ids, names) of rows whose name contains term, ignoring case.
+
+        Matching is on folded text (see inventory.indexes.fold), so "STRASSE"
+        finds "Straße".
+        """
+        term = fold(term)
+        if self.query_cache is not None:
+            return self.query_cache.get(self, "search", term, self._search)
+        return self._search(term)
+
+    def _search(self, term):
+        folded_names = self.folded_names
+        rows = None
+        if self.name_index is not None:
+            rows = self.name_index.candidates(term)
+            if rows is not None:
+                self.rows_scanned += len(rows)
+                rows = [i for i in sorted(rows) if term in folded_names[i]]
+        if rows is None:
+            self.rows_scanned += len(folded_names)
+            rows = [i for i, folded in enumerate(folded_names) if term in folded]
+        return take(self.product_ids, rows), take(self.names, rows)
+
+    def search_ranked(self, term, k=10):
+        """Return (ids, names, scores) of the k best prefix/fuzzy matches for term.
+
+        See inventory.fuzzy for the scoring; uses the token index when present
+        and scores every row otherwise.
+        """
+        ids, names, scores = [], [], []
+        for score, row in ranked_rows(self, term, k):
+            ids.append(self.product_ids[row])
+            names.append(self.names[row])
+            scores.append(score)
+        return ids, names, scores
+
+    def iter_low_stock(self, threshold):
+        """Yield (id, name, quantity) for rows with quantity <= threshold, in row order.
+
+        Rows are produced lazily, so a caller that stops early never scans
+        the rest of the store. Do not mutate the store while iterating.
+        """
+        product_ids = self.product_ids
+        names = self.names
+        quantities = self.quantities
+        i = -1
+        try:
+            for i in range(len(quantities)):
+                quantity = quantities[i]
+                if quantity <= threshold:
+                    yield product_ids[i], names[i], quantity
+        finally:
+            # Counted when the caller finishes or abandons the stream
+            self.rows_scanned += i + 1
+
+    def iter_search(self, term):
+        """Yield (id, name, quantity) for rows whose folded name contains term."""
+        term = fold(term)
+        product_ids = self.product_ids
+        names = self.names
+        quantities = self.quantities
+        i = -1
+        try:
+            for i, folded in enumerate(self.folded_names):
+                if term in folded:
+                    yield product_ids[i], names[i], quantities[i]
+        finally:
+            self.rows_scanned += i + 1
+
+    def filter(self, **criteria):
+        """Return Product views of the rows matching every given criterion.
+
+        Accepts category, min_quantity, max_quantity, min_price, max_price and
+        name_contains (see inventory.filters.Filter); results are in row order.
+        """
+        return [Product(self, row) for row in filters.run(self, filters.Filter(**criteria))]
+
+    def explain(self, **criteria):
+        """Return the planner's steps for filter(**criteria) as display lines."""
+        return filters.plan(self, filters.Filter(**criteria)).describe()
+
+    def category_counts(self):
+        """Return (unique_categories, counts) in first-seen order."""
+        if self.category_counter is not None:
+            counts = self.category_counter.counts()
+        else:
+            counts = count_codes(self.category_codes)
+            self.rows_scanned += len(self.category_codes)
+        table = self.category_names
+        return [table[code] for code in counts], list(counts.values())
+
+    def total_value(self):
+        """Return the sum of quantity * price over all rows."""
+        if self.value_total is not None:
+            return self.value_total.value
+        self.rows_scanned += len(self.quantities)
+        return dot_product(self.quantities, self.prices)
+
+    def valuation(self, price_bands=()):
+        """Return quantity * price count, sum, min, max and mean per category and price band.
+
+        price_bands is a PriceBands or its ascending edges. Both breakdowns
+        come from one pass over the columns; see inventory.valuation.
+        """
+        if not isinstance(price_bands, PriceBands):
+            price_bands = PriceBands(price_bands)
+        self.rows_scanned += len(self.quantities)
+        return valuate(self, price_bands)
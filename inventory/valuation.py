@@ -0,0 +1,135 @@
+"""Inventory value (quantity * price) grouped by category and by price band.
+
+``valuate`` makes one pass over the columns. Each row's value is added to
+its category's accumulator and its price band's accumulator, which keep only
+a count, a compensated (Neumaier) sum, a minimum and a maximum, so memory
+stays O(groups) however many rows there are. The overall figures are merged
+from the band accumulators, which between them cover every row once.
+"""
+import math
+import operator
+from bisect import bisect_right
+from collections import namedtuple
+
+GroupValue = namedtuple("GroupValue", "count sum min max mean")
+Valuation = namedtuple("Valuation", "by_category by_band overall")
+
+_EMPTY = GroupValue(0, 0.0, None, None, None)
+
+
+class PriceBands:
+    """Half-open price ranges split at ascending edges.
+
+    Edges ``(10, 100)`` give the bands ``< 10``, ``10 - 100`` (10 included,
+    100 not) and ``>= 100``; no edges give one band covering every price.
+    """
+
+    def __init__(self, edges=()):
+        edges = tuple(edges)
+        for edge in edges:
+            if isinstance(edge, bool) or not isinstance(edge, (int, float)) or math.isnan(edge):
+                raise TypeError("Price band edges must be numbers")
+        if any(low >= high for low, high in zip(edges, edges[1:])):
+            raise ValueError("Price band edges must be strictly increasing")
+        self.edges = edges
+
+    def __len__(self):
+        return len(self.edges) + 1
+
+    def band(self, price):
+        """Return the index of the band holding price."""
+        return bisect_right(self.edges, price)
+
+    def labels(self):
+        """Return one label per band, lowest first.
+
+        Edges are written with ``repr`` so every band gets a distinct label,
+        however close its edges are (``%g`` would print 1234567 and 1234568
+        alike); the labels key ``Valuation.by_band``.
+        """
+        edges = self.edges
+        if not edges:
+            return ["all"]
+        return (["< %r" % (edges[0],)]
+                + ["%r - %r" % pair for pair in zip(edges, edges[1:])]
+                + [">= %r" % (edges[-1],)])
+
+
+class Accumulator:
+    """Running count, compensated sum, minimum and maximum of some values."""
+
+    __slots__ = ("count", "total", "error", "low", "high")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.error = 0.0
+        self.low = self.high = None
+
+    def add(self, value):
+        """Fold value into the running figures."""
+        total = self.total + value
+        if abs(self.total) >= abs(value):
+            self.error += (self.total - total) + value
+        else:
+            self.error += (value - total) + self.total
+        self.total = total
+        if self.count:
+            if value < self.low:
+                self.low = value
+            elif value > self.high:
+                self.high = value
+        else:
+            self.low = self.high = value
+        self.count += 1
+
+    def merge(self, other):
+        """Fold another accumulator's figures into this one."""
+        if not other.count:
+            return
+        count, low, high = self.count, self.low, self.high
+        self.add(other.total)
+        self.error += other.error
+        self.count = count + other.count
+        if count:
+            self.low = min(low, other.low)
+            self.high = max(high, other.high)
+        else:
+            self.low, self.high = other.low, other.high
+
+    def value(self):
+        """Return the GroupValue of the values added so far."""
+        if not self.count:
+            return _EMPTY
+        total = self.total + self.error
+        return GroupValue(self.count, total, self.low, self.high, total / self.count)
+
+
+def valuate(store, bands=None):
+    """Return a Valuation of store grouped by category and by price band.
+
+    ``by_category`` maps each category with rows to its GroupValue, in
+    first-seen order. ``by_band`` maps every band label to its GroupValue,
+    including empty bands. ``overall`` covers all rows.
+    """
+    if bands is None:
+        bands = PriceBands()
+    edges = bands.edges
+    by_code = {}
+    by_band = [Accumulator() for _ in range(len(bands))]
+    values = map(operator.mul, store.quantities, store.prices)
+    for code, price, value in zip(store.category_codes, store.prices, values):
+        group = by_code.get(code)
+        if group is None:
+            group = by_code[code] = Accumulator()
+        group.add(value)
+        by_band[bisect_right(edges, price)].add(value)
+    overall = Accumulator()
+    for group in by_band:
+        overall.merge(group)
+    table = store.category_names
+    return Valuation(
+        {table[code]: group.value() for code, group in by_code.items()},
+        {label: group.value() for label, group in zip(bands.labels(), by_band)},
+        overall.value(),
+    )
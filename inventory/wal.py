@@ -0,0 +1,220 @@
+"""Write-ahead log and snapshot checkpoints for inventory mutations.
+
+A DurableInventory keeps its state in a directory holding at most one
+current generation of two files:
+
+    snapshot.<gen>.inv   full state written by a checkpoint (snapshot format)
+    wal.<gen>.log        mutations made after that snapshot
+
+Every mutation made through the store's API is captured by an observer and
+buffered as a framed log record (length, CRC32, JSON payload). ``commit``
+writes the buffered records with one sequential write and one fsync (group
+commit); the buffer is also committed automatically every ``group_size``
+records. Once the log has grown past ``compact_bytes`` the next explicit
+``commit`` (or ``close``) checkpoints: it writes a new snapshot and starts an
+empty log, so recovery only ever replays the tail of mutations made since the
+last checkpoint. Automatic group commits run inside store observer hooks,
+part-way through a mutation, so they never checkpoint themselves.
+"""
+import json
+import os
+import re
+import struct
+import zlib
+
+from inventory.indexes import StoreObserver
+from inventory.snapshot import open_snapshot, write_snapshot
+from inventory.store import InventoryStore
+
+_FRAME = struct.Struct("<II")
+_FILE = re.compile(r"^(snapshot|wal)\.(\d+)\.(inv|log)$")
+
+
+def encode_record(record):
+    payload = json.dumps(record, separators=(",", ":")).encode("utf-8")
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_records(path):
+    """Return (records, valid_length) for a log file.
+
+    Reading stops at the first torn or corrupt record; valid_length is the
+    byte offset where the intact prefix ends.
+    """
+    records = []
+    with open(path, "rb") as handle:
+        data = handle.read()
+    offset = 0
+    while offset + _FRAME.size <= len(data):
+        length, checksum = _FRAME.unpack_from(data, offset)
+        start = offset + _FRAME.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            break
+        records.append(json.loads(payload.decode("utf-8")))
+        offset = start + length
+    return records, offset
+
+
+def apply_record(store, record):
+    """Apply one logged mutation to store (which must have an id index)."""
+    kind = record[0]
+    if kind == "add":
+        store.append(*record[1:])
+    elif kind == "set":
+        product_id, field, value = record[1:]
+        row = store.row_of(product_id)
+        if field == "quantity":
+            store.set_quantity(row, value)
+        elif field == "price":
+            store.set_price(row, value)
+        elif field == "name":
+            store.rename(row, value)
+        elif field == "category":
+            store.recategorize(row, value)
+        else:
+            raise ValueError("Unknown field in log record: %r" % field)
+    elif kind == "del":
+        store.delete(record[1])
+    else:
+        raise ValueError("Unknown log record: %r" % kind)
+
+
+class WalObserver(StoreObserver):
+    """Turns store mutations into buffered log records."""
+
+    def __init__(self, durable):
+        self.durable = durable
+        self.attached = False
+
+    def rebuild(self, store):
+        # The first rebuild is the attach itself; later ones mean the rows
+        # changed wholesale (a bulk load), which only a checkpoint captures.
+        if self.attached:
+            self.durable.checkpoint()
+        self.attached = True
+
+    def row_added(self, store, row):
+        self.durable.log(["add"] + list(store.row(row)))
+
+    def row_changed(self, store, row, field, old, new):
+        self.durable.log(["set", store.product_ids[row], field, new])
+
+    def row_removed(self, store, row):
+        self.durable.log(["del", store.product_ids[row]])
+
+
+class DurableInventory:
+    """An InventoryStore persisted through a write-ahead log and checkpoints.
+
+    Mutate ``self.store`` through its normal API; changes are durable once
+    ``commit`` returns (or after ``close``).
+    """
+
+    def __init__(self, directory, group_size=256, compact_bytes=64 * 1024 * 1024, fsync=True):
+        self.directory = directory
+        self.group_size = group_size
+        self.compact_bytes = compact_bytes
+        self.fsync = fsync
+        self._buffer = []
+        self._log = None
+        self._needs_compaction = False
+        os.makedirs(directory, exist_ok=True)
+        self.generation, self.store, self.replayed = self._recover()
+        self._open_log()
+        self._observer = WalObserver(self)
+        self.store.attach(self._observer)
+
+    def _path(self, kind, generation):
+        extension = "inv" if kind == "snapshot" else "log"
+        return os.path.join(self.directory, "%s.%d.%s" % (kind, generation, extension))
+
+    def _generations(self, kind):
+        found = []
+        for name in os.listdir(self.directory):
+            match = _FILE.match(name)
+            if match and match.group(1) == kind:
+                found.append(int(match.group(2)))
+        return sorted(found)
+
+    def _recover(self):
+        """Load the newest snapshot and replay its log tail."""
+        snapshots = self._generations("snapshot")
+        generation = snapshots[-1] if snapshots else 0
+        if snapshots:
+            with open_snapshot(self._path("snapshot", generation)) as mapped:
+                store = mapped.to_store()
+        else:
+            store = InventoryStore()
+        store.create_id_index()
+        replayed = 0
+        log_path = self._path("wal", generation)
+        if os.path.exists(log_path):
+            records, valid_length = read_records(log_path)
+            for record in records:
+                apply_record(store, record)
+            replayed = len(records)
+            if valid_length < os.path.getsize(log_path):
+                # Drop a torn tail left by a crash mid-write
+                with open(log_path, "r+b") as handle:
+                    handle.truncate(valid_length)
+        return generation, store, replayed
+
+    def _open_log(self):
+        self._log = open(self._path("wal", self.generation), "ab")
+
+    def log(self, record):
+        self._buffer.append(encode_record(record))
+        if len(self._buffer) >= self.group_size:
+            self._write()
+
+    def _write(self):
+        """Append and fsync the buffered records; safe inside an observer hook."""
+        if not self._buffer:
+            return
+        self._log.write(b"".join(self._buffer))
+        self._buffer = []
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        if self._log.tell() >= self.compact_bytes:
+            # The store may be mid-mutation here, so leave the snapshot to commit()
+            self._needs_compaction = True
+
+    def commit(self):
+        """Write buffered records in one append and fsync them.
+
+        Checkpoints if the log has outgrown ``compact_bytes``; call it between
+        mutations, never from inside a store observer.
+        """
+        self._write()
+        if self._needs_compaction:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Write a snapshot of the current state and start an empty log."""
+        self._buffer = []
+        self._needs_compaction = False
+        next_generation = self.generation + 1
+        write_snapshot(self.store, self._path("snapshot", next_generation))
+        self._log.close()
+        previous = self.generation
+        self.generation = next_generation
+        self._open_log()
+        for kind in ("snapshot", "wal"):
+            for generation in self._generations(kind):
+                if generation <= previous:
+                    os.remove(self._path(kind, generation))
+
+    def close(self):
+        if self._log is not None:
+            self.commit()
+            self._log.close()
+            self._log = None
+            self.store.detach(self._observer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
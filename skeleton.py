@@ -1,92 +1,333 @@
-# DO NOT MODIFY THE SECTIONS MARKED AS "DO NOT MODIFY"
-# Sample inventory data - DO NOT MODIFY
-product_ids = ["P001", "P002", "P003"]
-names = ["Rice 5kg", "Wheat Flour 1kg", "Mobile Charger"]
-categories = ["Grocery", "Grocery", "Electronics"]
-quantities = [45, 8, 15]
-prices = [250.00, 60.00, 300.00]
-
-def find_low_stock_items(threshold):
-    """
-    TODO: Use a loop to find items with quantity below threshold
-    Return lists of product details for low stock items
-    """
-    # Validation - DO NOT MODIFY
-    if threshold is None: 
-        raise TypeError("Threshold cannot be None")
-    if not isinstance(threshold, int):
-        raise TypeError("Threshold must be an integer")
-    if threshold <= 0 or threshold > 100:
-        raise ValueError("Threshold must be between 1 and 100")
-    
-    # TODO: Implement the following using a for loop
-    # 1. Create empty result lists (for ids, names, quantities)
-    # 2. Loop through the inventory using range(len(product_ids))
-    # 3. If an item's quantity is <= threshold, add its details to result lists
-    # 4. Return the result lists
-    pass
-
-def search_products(term):
-    """
-    TODO: Use a loop to find items where name contains term (case-insensitive)
-    Return lists of product details for matching items
-    """
-    # Validation - DO NOT MODIFY
-    if term is None:
-        raise TypeError("Search term cannot be None")
-    if not isinstance(term, str):
-        raise TypeError("Search term must be a string")
-    
-    # TODO: Implement the following using a for loop
-    # 1. Create empty result lists (for ids, names)
-    # 2. Convert search term to lowercase
-    # 3. Loop through the inventory using range(len(names))
-    # 4. If term is in item's name (case-insensitive), add to result lists
-    # 5. Return the result lists
-    pass
-
-def count_by_category():
-    """
-    TODO: Use nested loops to count items in each category
-    Return lists of categories and their counts
-    """
-    # TODO: Implement the following using nested loops
-    # 1. Create a list for unique categories
-    # 2. Loop through categories to find unique ones
-    # 3. Create a list for category counts
-    # 4. For each unique category, loop through all categories to count occurrences
-    # 5. Return both lists (unique categories and counts)
-    pass
-
-def calculate_total_value():
-    """
-    TODO: Use a loop to calculate total value (quantity * price) of all items
-    Return the total value as a float
-    """
-    # TODO: Implement the following using a for loop
-    # 1. Initialize total value as 0
-    # 2. Loop through the inventory using range(len(quantities))
-    # 3. Calculate item_value = quantities[i] * prices[i]
-    # 4. Add item_value to total
-    # 5. Return the total value
-    pass
-
-def main():
-    """
-    TODO: Implement the main menu loop
-    """
-    # TODO: Implement the following:
-    # 1. Create a loop to repeatedly show menu
-    # 2. Show options (1-5)
-    # 3. Get user choice
-    # 4. Based on choice:
-    #    - For low stock items: Get threshold, call function, display results
-    #    - For search: Get search term, call function, display results
-    #    - For category count: Call function, display results
-    #    - For total value: Call function, display result
-    #    - For exit: Break the loop
-    # 5. Handle invalid inputs
-    pass
-
-if __name__ == "__main__":
+from itertools import islice
+
+from inventory import Instrumentation, InventoryStore
+from inventory.batch import low_stock_batch, search_batch
+
+# DO NOT MODIFY THE SECTIONS MARKED AS "DO NOT MODIFY"
+# Sample inventory data - DO NOT MODIFY
+product_ids = ["P001", "P002", "P003"]
+names = ["Rice 5kg", "Wheat Flour 1kg", "Mobile Charger"]
+categories = ["Grocery", "Grocery", "Electronics"]
+quantities = [45, 8, 15]
+prices = [250.00, 60.00, 300.00]
+
+# Columnar store seeded from the sample data; the query functions run against it
+inventory = InventoryStore.from_lists(product_ids, names, categories, quantities, prices)
+inventory.create_id_index()
+inventory.create_quantity_index()
+inventory.create_name_index()
+inventory.create_token_index()
+inventory.create_category_counter()
+inventory.create_value_total()
+inventory.create_query_cache()
+
+# Opt-in metrics and cProfile capture, toggled from the menu
+instrumentation = Instrumentation()
+
+def _resolve_store(store):
+    """Return the store to query, defaulting to the module-level inventory."""
+    return inventory if store is None else store
+
+def find_low_stock_items(threshold, store=None):
+    """
+    Find items whose quantity is at or below threshold.
+    Returns (ids, names, quantities) lists for the low stock items
+    """
+    # Validation - DO NOT MODIFY
+    if threshold is None: 
+        raise TypeError("Threshold cannot be None")
+    if not isinstance(threshold, int):
+        raise TypeError("Threshold must be an integer")
+    if threshold <= 0 or threshold > 100:
+        raise ValueError("Threshold must be between 1 and 100")
+    
+    return _resolve_store(store).low_stock(threshold)
+
+def search_products(term, store=None):
+    """
+    Find items whose name contains term (case-insensitive).
+    Returns (ids, names) lists for the matching items
+    """
+    # Validation - DO NOT MODIFY
+    if term is None:
+        raise TypeError("Search term cannot be None")
+    if not isinstance(term, str):
+        raise TypeError("Search term must be a string")
+    
+    return _resolve_store(store).search(term)
+
+def count_by_category(store=None):
+    """
+    Count items in each category.
+    Returns lists of categories (first-seen order) and their counts
+    """
+    return _resolve_store(store).category_counts()
+
+def calculate_total_value(store=None):
+    """
+    Calculate the total value (quantity * price) of all items.
+    Returns the total value as a float
+    """
+    return _resolve_store(store).total_value()
+
+def value_by_group(price_bands=(), store=None):
+    """
+    Break the total value down by category and by price band in one pass.
+    price_bands are ascending price edges; returns a Valuation whose
+    by_category and by_band map to (count, sum, min, max, mean) of quantity * price
+    """
+    if price_bands is None:
+        raise TypeError("Price bands cannot be None")
+    return _resolve_store(store).valuation(price_bands)
+
+def find_low_stock_items_batch(thresholds, store=None):
+    """
+    Find low stock items for several thresholds in one pass.
+    Returns one (ids, names, quantities) tuple per threshold, in order
+    """
+    if thresholds is None:
+        raise TypeError("Thresholds cannot be None")
+    thresholds = list(thresholds)
+    for threshold in thresholds:
+        if threshold is None:
+            raise TypeError("Threshold cannot be None")
+        if not isinstance(threshold, int):
+            raise TypeError("Threshold must be an integer")
+        if threshold <= 0 or threshold > 100:
+            raise ValueError("Threshold must be between 1 and 100")
+    return low_stock_batch(_resolve_store(store), thresholds)
+
+def search_products_ranked(term, k=10, store=None):
+    """
+    Find the k best matches for term, tolerating typos and partial words.
+    Exact words rank above prefixes, and prefixes above near misses.
+    Returns (ids, names, scores) lists, best match first
+    """
+    if term is None:
+        raise TypeError("Search term cannot be None")
+    if not isinstance(term, str):
+        raise TypeError("Search term must be a string")
+    if isinstance(k, bool) or not isinstance(k, int) or k <= 0:
+        raise ValueError("k must be a positive integer")
+    return _resolve_store(store).search_ranked(term, k)
+
+def search_products_batch(terms, store=None):
+    """
+    Search for several terms (case-insensitive) in one pass.
+    Returns one (ids, names) tuple per term, in order
+    """
+    if terms is None or isinstance(terms, str):
+        raise TypeError("Search terms must be a list of strings")
+    terms = list(terms)
+    for term in terms:
+        if term is None:
+            raise TypeError("Search term cannot be None")
+        if not isinstance(term, str):
+            raise TypeError("Search term must be a string")
+    return search_batch(_resolve_store(store), terms)
+
+def filter_products(category=None, min_quantity=None, max_quantity=None,
+                    min_price=None, max_price=None, name_contains=None, store=None):
+    """
+    Find items matching every given criterion; None leaves a criterion open.
+    Quantity and price bounds are inclusive and name_contains is case-insensitive.
+    Returns (ids, names, categories, quantities, prices) lists in inventory order
+    """
+    products = _resolve_store(store).filter(
+        category=category, min_quantity=min_quantity, max_quantity=max_quantity,
+        min_price=min_price, max_price=max_price, name_contains=name_contains)
+    rows = [product.as_tuple() for product in products]
+    if not rows:
+        return [], [], [], [], []
+    return tuple(list(column) for column in zip(*rows))
+
+def apply_stock_movements(movements, store=None):
+    """
+    Apply a batch of (product_id, delta) quantity movements in one pass.
+    Deltas for the same product are combined; the batch is rejected as a
+    whole if an id is unknown or a quantity would go negative.
+    Returns the number of products changed
+    """
+    if movements is None:
+        raise TypeError("Movements cannot be None")
+    return _resolve_store(store).apply_movements(movements)
+
+def subscribe_low_stock(threshold, callback=None, queue=None, category=None, store=None):
+    """
+    Get notified when an item's quantity drops to or below threshold.
+    Events go to callback(event) and/or an asyncio queue, optionally for one
+    category only. Returns a subscription to pass to unsubscribe_low_stock
+    """
+    if threshold is None:
+        raise TypeError("Threshold cannot be None")
+    if not isinstance(threshold, int):
+        raise TypeError("Threshold must be an integer")
+    if threshold <= 0 or threshold > 100:
+        raise ValueError("Threshold must be between 1 and 100")
+    alerts = _resolve_store(store).create_low_stock_alerts()
+    return alerts.subscribe(threshold, callback=callback, queue=queue, category=category)
+
+def unsubscribe_low_stock(subscription, store=None):
+    """Cancel a subscription made with subscribe_low_stock"""
+    _resolve_store(store).create_low_stock_alerts().unsubscribe(subscription)
+
+def _check_page(limit, offset):
+    """Validate limit/offset pagination arguments."""
+    if limit is not None and (not isinstance(limit, int) or limit < 0):
+        raise ValueError("Limit must be a non-negative integer or None")
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError("Offset must be a non-negative integer")
+
+def _page(rows, limit, offset):
+    return islice(rows, offset, None if limit is None else offset + limit)
+
+def iter_low_stock_items(threshold, limit=None, offset=0, store=None):
+    """
+    Stream items whose quantity is at or below threshold.
+    Returns a lazy iterator of (id, name, quantity) tuples, skipping offset
+    matches and stopping after limit
+    """
+    if threshold is None:
+        raise TypeError("Threshold cannot be None")
+    if not isinstance(threshold, int):
+        raise TypeError("Threshold must be an integer")
+    if threshold <= 0 or threshold > 100:
+        raise ValueError("Threshold must be between 1 and 100")
+    _check_page(limit, offset)
+    return _page(_resolve_store(store).iter_low_stock(threshold), limit, offset)
+
+def iter_search_products(term, limit=None, offset=0, store=None):
+    """
+    Stream items whose name contains term (case-insensitive).
+    Returns a lazy iterator of (id, name, quantity) tuples, skipping offset
+    matches and stopping after limit
+    """
+    if term is None:
+        raise TypeError("Search term cannot be None")
+    if not isinstance(term, str):
+        raise TypeError("Search term must be a string")
+    _check_page(limit, offset)
+    return _page(_resolve_store(store).iter_search(term), limit, offset)
+
+MENU = """
+===== Inventory Management System =====
+1. Find low stock items
+2. Search products
+3. Count items by category
+4. Calculate total inventory value
+5. Exit
+6. Toggle profiling"""
+
+def format_low_stock(result):
+    """Return display lines for a find_low_stock_items result"""
+    low_ids, low_names, low_quantities = result
+    if not low_ids:
+        return ["No items at or below the threshold."]
+    lines = ["Low stock items:"]
+    for i in range(len(low_ids)):
+        lines.append(f"  {low_ids[i]} | {low_names[i]} | Qty: {low_quantities[i]}")
+    return lines
+
+def format_search(result):
+    """Return display lines for a search_products result"""
+    found_ids, found_names = result
+    if not found_ids:
+        return ["No matching products found."]
+    lines = ["Matching products:"]
+    for i in range(len(found_ids)):
+        lines.append(f"  {found_ids[i]} | {found_names[i]}")
+    return lines
+
+def format_categories(result):
+    """Return display lines for a count_by_category result"""
+    unique_categories, category_counts = result
+    lines = ["Items per category:"]
+    for i in range(len(unique_categories)):
+        lines.append(f"  {unique_categories[i]}: {category_counts[i]}")
+    return lines
+
+def format_total(total):
+    """Return display lines for a calculate_total_value result"""
+    return [f"Total inventory value: {total:.2f}"]
+
+def toggle_profiling(metrics_path=None):
+    """
+    Turn instrumentation and cProfile capture on, or off again.
+    Returns display lines; switching off reports per-operation metrics and
+    the top profile entries, and writes the metrics to metrics_path if given
+    """
+    if not instrumentation.profiling:
+        instrumentation.reset()
+        instrumentation.enable()
+        instrumentation.start_profile()
+        return ["Profiling enabled. Choose 6 again to stop and show the report."]
+    profile = instrumentation.stop_profile()
+    instrumentation.disable()
+    if metrics_path is not None:
+        instrumentation.write(metrics_path)
+    lines = ["Profiling disabled. Operation metrics:"]
+    lines.extend(instrumentation.summary_lines() or ["  (no inventory operations recorded)"])
+    lines.extend(profile.rstrip().splitlines())
+    return lines
+
+PAGE_SIZE = 20
+
+def print_pages(rows, header, empty, format_row, page_size=PAGE_SIZE):
+    """Print streamed rows a page at a time, asking before each further page"""
+    rows = iter(rows)
+    page = list(islice(rows, page_size))
+    if not page:
+        print(empty)
+        return
+    print(header)
+    while page:
+        for row in page:
+            print(format_row(row))
+        page = list(islice(rows, page_size))
+        if page and input("Show more results? (y/n): ").strip().lower() != "y":
+            break
+
+def main():
+    """
+    Run the interactive menu loop until the user chooses Exit
+    """
+    while True:
+        print(MENU)
+        try:
+            choice = input("Enter your choice (1-6): ").strip()
+        except EOFError:
+            break
+        try:
+            if choice == "1":
+                threshold = int(input("Enter stock threshold (1-100): ").strip())
+                print_pages(iter_low_stock_items(threshold), "Low stock items:",
+                            "No items at or below the threshold.",
+                            lambda row: f"  {row[0]} | {row[1]} | Qty: {row[2]}")
+                lines = []
+            elif choice == "2":
+                term = input("Enter search term: ")
+                print_pages(iter_search_products(term), "Matching products:",
+                            "No matching products found.",
+                            lambda row: f"  {row[0]} | {row[1]}")
+                lines = []
+            elif choice == "3":
+                lines = format_categories(count_by_category())
+            elif choice == "4":
+                lines = format_total(calculate_total_value())
+            elif choice == "5":
+                print("Exiting Inventory Management System. Goodbye!")
+                break
+            elif choice == "6":
+                lines = toggle_profiling()
+            else:
+                lines = ["Invalid choice. Please enter a number from 1 to 6."]
+        except (TypeError, ValueError) as e:
+            # Non-numeric and out-of-range thresholds both land here
+            lines = [f"Invalid input: {e}"]
+        except EOFError:
+            break
+        for line in lines:
+            print(line)
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,144 @@
+import argparse
+import contextlib
+import importlib
+import io
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MODULES = ["test.test_functional", "test.test_boundary", "test.test_exceptional"]
+
+class _ThreadLocalStdout:
+    """sys.stdout stand-in that sends each worker thread's prints to its own buffer"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        buffer = getattr(self.local, "buffer", None)
+        (buffer or self.stream).flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+class ParallelRunner:
+    """Runs unittest cases on a thread pool with one shared import of the module under test.
+
+    Results and captured output are reported in suite order, so the outcome
+    is the same as a serial run whatever order the workers finish in.
+    """
+
+    def __init__(self, module_names=None, workers=4, target=None):
+        self.module_names = module_names or DEFAULT_MODULES
+        self.workers = workers
+        self.target = target
+
+    def load_target(self):
+        """Import the module under test once (skeleton, else solution)"""
+        if self.target is None:
+            for name in ("skeleton", "solution"):
+                try:
+                    self.target = importlib.import_module(name)
+                    break
+                except ImportError:
+                    continue
+        return self.target
+
+    def load_tests(self):
+        """Import the test modules and flatten their cases"""
+        loader = unittest.TestLoader()
+        cases = []
+        for name in self.module_names:
+            module = importlib.import_module(name)
+            cases.extend(self._flatten(loader.loadTestsFromModule(module)))
+        return cases
+
+    @contextlib.contextmanager
+    def share_target(self):
+        """Point each test module's load_module_dynamically at the shared import.
+
+        The modules' own functions are put back on exit, so tests run later
+        in the same process import the target as usual.
+        """
+        target = self.load_target()
+        originals = []
+        try:
+            for name in self.module_names:
+                module = importlib.import_module(name)
+                if hasattr(module, "load_module_dynamically"):
+                    originals.append((module, module.load_module_dynamically))
+                    module.load_module_dynamically = lambda: target
+            yield target
+        finally:
+            for module, function in reversed(originals):
+                module.load_module_dynamically = function
+
+    def _flatten(self, suite):
+        for test in suite:
+            if isinstance(test, unittest.TestSuite):
+                yield from self._flatten(test)
+            else:
+                yield test
+
+    def _run_one(self, test, stdout):
+        stdout.local.buffer = io.StringIO()
+        result = unittest.TestResult()
+        try:
+            test(result)
+        finally:
+            output = stdout.local.buffer.getvalue()
+            stdout.local.buffer = None
+        if result.errors:
+            outcome = "error"
+        elif result.failures:
+            outcome = "fail"
+        elif result.skipped:
+            outcome = "skip"
+        elif result.expectedFailures:
+            outcome = "expected failure"
+        elif result.unexpectedSuccesses:
+            outcome = "unexpected success"
+        else:
+            outcome = "ok"
+        details = [text for _, text in result.errors + result.failures]
+        return test.id(), outcome, output, details
+
+    def run(self):
+        """Run every case and return (test_id, outcome, output, details) in suite order"""
+        cases = self.load_tests()
+        with self.share_target():
+            stdout = _ThreadLocalStdout(sys.stdout)
+            sys.stdout = stdout
+            try:
+                if self.workers <= 1:
+                    return [self._run_one(test, stdout) for test in cases]
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    return list(pool.map(lambda test: self._run_one(test, stdout), cases))
+            finally:
+                sys.stdout = stdout.stream
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m test.ParallelRunner")
+    parser.add_argument("modules", nargs="*", help="test modules to run (default: the assignment tests)")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+    results = ParallelRunner(args.modules, args.workers).run()
+    failed = 0
+    for test_id, outcome, output, details in results:
+        sys.stdout.write(output)
+        print("%s ... %s" % (test_id, outcome))
+        for text in details:
+            print(text)
+        if outcome in ("error", "fail", "unexpected success"):
+            failed += 1
+    print("Ran %d tests, %d failed" % (len(results), failed))
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
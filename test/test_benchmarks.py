@@ -0,0 +1,42 @@
+import unittest
+from benchmarks import suite
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_generated_inventory_is_skewed(self):
+        """Generated rows are deterministic and the first category dominates"""
+        rows = list(suite.generate_rows(2000, seed=1))
+        self.assertEqual(rows, list(suite.generate_rows(2000, seed=1)))
+        counts = {}
+        for row in rows:
+            counts[row[2]] = counts.get(row[2], 0) + 1
+        self.assertEqual(max(counts, key=counts.get), suite.CATEGORIES[0])
+
+    def test_report_shape_and_compare(self):
+        """A tiny run reports every query and compare flags slowdowns"""
+        report = suite.run(sizes=[300], modes=["indexed"], budget=0.01)
+        cases = {result["case"] for result in report["results"]}
+        self.assertEqual(cases, set(suite.QUERIES) | {"build", "load", "products", "movements"})
+        for result in report["results"]:
+            if "p50_ms" in result:
+                self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+        slower = {"results": [dict(result, p50_ms=result["p50_ms"] * 3)
+                              for result in report["results"] if "p50_ms" in result]}
+        self.assertEqual(suite.compare(report, report), [])
+        self.assertEqual(len(suite.compare(report, slower)), len(slower["results"]))
+
+    def test_build_reports_list_baseline(self):
+        """A bare store holds under 90% of the bytes per row of five plain lists, packed under half"""
+        results = {result["mode"]: result for result in suite.bench_build(20000, seed=2)}
+        self.assertEqual(results["lists"]["store_rows"], 20000)
+        lists = results["lists"]["bytes_per_row"]
+        self.assertLess(results["columns"]["bytes_per_row"], 0.9 * lists)
+        self.assertLess(results["packed"]["bytes_per_row"], 0.5 * lists)
+
+    def test_product_views_are_smaller_than_dicts(self):
+        """Materialized Product views trace less memory than dicts, and streaming them almost none"""
+        results = {result["mode"]: result for result in suite.bench_products(2000, seed=3)}
+        self.assertLess(results["view"]["peak_bytes"], results["dict"]["peak_bytes"] / 2)
+        self.assertLess(results["view_iter"]["peak_bytes"], results["view"]["peak_bytes"] / 10)
+
+if __name__ == '__main__':
+    unittest.main()
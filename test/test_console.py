@@ -0,0 +1,122 @@
+import asyncio
+import io
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+import skeleton
+from console_server import InventoryConsoleServer
+from test.test_inventory_indexes import build_random_store
+
+class SlowSearchStore:
+    """Wraps a store so that search takes a noticeable time"""
+
+    def __init__(self, store, delay):
+        self.store = store
+        self.delay = delay
+
+    def search(self, term):
+        time.sleep(self.delay)
+        return self.store.search(term)
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+class TestMainMenu(unittest.TestCase):
+    def run_main(self, *answers):
+        output = io.StringIO()
+        with mock.patch("builtins.input", side_effect=list(answers)), redirect_stdout(output):
+            skeleton.main()
+        return output.getvalue()
+
+    def test_menu_choices(self):
+        """Each menu option prints its results and 5 exits"""
+        output = self.run_main("1", "10", "2", "rice", "3", "4", "5")
+        self.assertIn("P002 | Wheat Flour 1kg | Qty: 8", output)
+        self.assertIn("P001 | Rice 5kg", output)
+        self.assertIn("Grocery: 2", output)
+        self.assertIn("Total inventory value: 16230.00", output)
+        self.assertIn("Goodbye", output)
+
+    def test_invalid_inputs(self):
+        """Bad choices and thresholds are reported and the loop continues"""
+        output = self.run_main("9", "1", "abc", "1", "0", "5")
+        self.assertIn("Invalid choice", output)
+        self.assertIn("Threshold must be between 1 and 100", output)
+        self.assertEqual(output.count("Invalid input"), 2)
+
+    def test_results_are_paged(self):
+        """Long result lists print one page at a time until the user declines"""
+        store = build_random_store(100)
+        output = io.StringIO()
+        with mock.patch.object(skeleton, "inventory", store), \
+                mock.patch("builtins.input", side_effect=["2", "item", "y", "n", "5"]), \
+                redirect_stdout(output):
+            skeleton.main()
+        self.assertEqual(output.getvalue().count(" | Item "), 2 * skeleton.PAGE_SIZE)
+        self.assertIn("Goodbye", output.getvalue())
+
+    def test_profiling_toggle(self):
+        """Choosing 6 twice records the queries in between and prints the report"""
+        output = self.run_main("6", "4", "3", "1", "10", "2", "rice", "6", "5")
+        self.assertIn("Profiling enabled", output)
+        self.assertIn("iter_low_stock: 1 calls", output)
+        self.assertIn("iter_search: 1 calls", output)
+        self.assertIn("total_value: 1 calls", output)
+        self.assertIn("category_counts: 1 calls", output)
+        self.assertFalse(skeleton.instrumentation.enabled)
+
+    def test_end_of_input_exits(self):
+        """Closing stdin ends the menu loop"""
+        output = io.StringIO()
+        with mock.patch("builtins.input", side_effect=EOFError), redirect_stdout(output):
+            skeleton.main()
+
+class TestConsoleServer(unittest.TestCase):
+    async def session(self, port, commands):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write("".join(line + "\n" for line in commands).encode("utf-8"))
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+        return data.decode("utf-8"), time.perf_counter()
+
+    def test_concurrent_sessions(self):
+        """A slow search in one session does not hold up another session"""
+        async def scenario():
+            server = InventoryConsoleServer(store=SlowSearchStore(skeleton.inventory, 0.5))
+            listener = await server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                slow = asyncio.create_task(self.session(port, ["2", "rice", "5"]))
+                await asyncio.sleep(0.05)
+                fast_output, fast_done = await self.session(port, ["3", "1", "10", "5"])
+                slow_output, slow_done = await slow
+            finally:
+                await server.close()
+            return fast_output, fast_done, slow_output, slow_done
+
+        fast_output, fast_done, slow_output, slow_done = asyncio.run(scenario())
+        self.assertIn("Grocery: 2", fast_output)
+        self.assertIn("P002 | Wheat Flour 1kg | Qty: 8", fast_output)
+        self.assertIn("P001 | Rice 5kg", slow_output)
+        self.assertLess(fast_done, slow_done)
+
+    def test_profiling_is_not_offered(self):
+        """Remote sessions cannot toggle process-wide profiling"""
+        async def scenario():
+            server = InventoryConsoleServer()
+            listener = await server.start(port=0)
+            try:
+                output, _ = await self.session(listener.sockets[0].getsockname()[1], ["6", "5"])
+            finally:
+                await server.close()
+            return output
+
+        output = asyncio.run(scenario())
+        self.assertNotIn("Toggle profiling", output)
+        self.assertIn("Invalid choice", output)
+        self.assertFalse(skeleton.instrumentation.enabled)
+
+if __name__ == '__main__':
+    unittest.main()
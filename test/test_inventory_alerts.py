@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+import skeleton
+from inventory import InventoryStore
+
+SAMPLE = (
+    ["P001", "P002", "P003"],
+    ["Rice 5kg", "Wheat Flour 1kg", "Mobile Charger"],
+    ["Grocery", "Grocery", "Electronics"],
+    [45, 8, 15],
+    [250.00, 60.00, 300.00],
+)
+
+class TestLowStockAlerts(unittest.TestCase):
+    def setUp(self):
+        self.store = InventoryStore.from_lists(*SAMPLE)
+        self.store.create_id_index()
+        self.alerts = self.store.create_low_stock_alerts()
+        self.events = []
+
+    def test_edge_triggered(self):
+        """Only crossings notify; staying low or staying stocked does not"""
+        self.alerts.subscribe(10, self.events.append)
+        self.store.update("P003", quantity=12)
+        self.store.update("P003", quantity=10)
+        self.store.update("P003", quantity=4)
+        self.store.update("P002", quantity=3)
+        self.store.update("P003", quantity=40)
+        self.store.update("P003", quantity=9)
+        self.assertEqual([(e.product_id, e.quantity, e.low) for e in self.events],
+                         [("P003", 10, True), ("P003", 9, True)])
+
+    def test_recovery_and_category_scope(self):
+        """Category subscriptions ignore other categories and can hear recoveries"""
+        self.alerts.subscribe(20, self.events.append, category="Electronics", recovery=True)
+        self.store.update("P001", quantity=1)
+        self.store.update("P003", quantity=30)
+        self.store.update("P003", quantity=20)
+        self.store.update("P003", quantity=21)
+        self.store.update("P001", category="Electronics")
+        self.assertEqual([(e.product_id, e.low) for e in self.events],
+                         [("P003", False), ("P003", True), ("P003", False), ("P001", True)])
+
+    def test_batches_inserts_and_unsubscribe(self):
+        """Movement batches and new low items notify, and unsubscribed thresholds go quiet"""
+        subscription = self.alerts.subscribe(10, self.events.append)
+        self.alerts.subscribe(50, lambda event: 1 / 0)
+        self.store.apply_movements([("P001", -40), ("P003", -1), ("P002", -1)])
+        self.store.append("P004", "Salt", "Grocery", 2, 20.0)
+        self.assertEqual([e.product_id for e in self.events], ["P001", "P004"])
+        self.assertEqual(len(self.alerts.errors), 1)
+        self.alerts.unsubscribe(subscription)
+        self.store.update("P003", quantity=1)
+        self.assertEqual(len(self.events), 2)
+        self.assertEqual(len(self.alerts), 1)
+
+    def test_asyncio_queue(self):
+        """Queue subscribers receive events on their event loop, even from other threads"""
+        async def scenario():
+            queue = asyncio.Queue()
+            skeleton.subscribe_low_stock(10, queue=queue, store=self.store)
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda: self.store.update("P001", quantity=5))
+            return await asyncio.wait_for(queue.get(), 2)
+        event = asyncio.run(scenario())
+        self.assertEqual((event.product_id, event.quantity, event.threshold), ("P001", 5, 10))
+
+    def test_validation(self):
+        """Thresholds are validated like find_low_stock_items and need a receiver"""
+        with self.assertRaises(ValueError):
+            skeleton.subscribe_low_stock(0, print, store=self.store)
+        with self.assertRaises(TypeError):
+            skeleton.subscribe_low_stock("5", print, store=self.store)
+        with self.assertRaises(ValueError):
+            self.alerts.subscribe(5)
+
+if __name__ == '__main__':
+    unittest.main()
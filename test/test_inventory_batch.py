@@ -0,0 +1,46 @@
+import unittest
+import skeleton
+from inventory import AhoCorasick, low_stock_batch, search_batch
+from test.test_inventory_indexes import build_random_store
+
+class TestBatchQueries(unittest.TestCase):
+    def setUp(self):
+        """Build a scan-only store and an indexed copy"""
+        self.plain = build_random_store(250)
+        self.indexed = build_random_store(250)
+        self.indexed.create_quantity_index()
+
+    def test_thresholds_match_single_queries(self):
+        """Each batch answer equals the single-threshold query, in input order"""
+        thresholds = [50, 1, 10, 10, 100, 37]
+        for store in (self.plain, self.indexed):
+            expected = [store.low_stock(threshold) for threshold in thresholds]
+            self.assertEqual(low_stock_batch(store, thresholds), expected)
+
+    def test_terms_match_single_queries(self):
+        """Each batch answer equals the single-term search, including empty terms"""
+        terms = ["item 1", "ITEM 1", "", "tem", "m 4", "nothing", "1"]
+        expected = [self.plain.search(term) for term in terms]
+        self.assertEqual(search_batch(self.plain, terms), expected)
+
+    def test_automaton_overlapping_patterns(self):
+        """Overlapping and nested patterns are all reported"""
+        automaton = AhoCorasick(["he", "she", "his", "hers", "e"])
+        self.assertEqual(automaton.matches("ushers"), {0, 1, 3, 4})
+        self.assertEqual(automaton.matches("xyz"), set())
+
+    def test_skeleton_batch_validation(self):
+        """Batch wrappers validate every threshold and term"""
+        self.assertEqual(skeleton.find_low_stock_items_batch([10])[0], skeleton.find_low_stock_items(10))
+        self.assertEqual(skeleton.search_products_batch(["rice"])[0], skeleton.search_products("rice"))
+        with self.assertRaises(ValueError):
+            skeleton.find_low_stock_items_batch([10, 0])
+        with self.assertRaises(TypeError):
+            skeleton.find_low_stock_items_batch([10, "5"])
+        with self.assertRaises(TypeError):
+            skeleton.search_products_batch("rice")
+        with self.assertRaises(TypeError):
+            skeleton.search_products_batch(["rice", None])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import random
+import unittest
+from inventory import InventoryStore
+from test.test_inventory_indexes import build_random_store
+
+THRESHOLDS = (1, 5, 10, 50, 100)
+TERMS = ("item 1", "Item 4", "3", "ITEM 22", "")
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        """Build a random store and a cached copy"""
+        self.rng = random.Random(5)
+        self.plain = build_random_store(300)
+        self.cached = build_random_store(300)
+        self.cached.create_quantity_index()
+        self.cache = self.cached.create_query_cache(maxsize=64)
+
+    def assert_same_results(self):
+        for threshold in THRESHOLDS:
+            self.assertEqual(self.cached.low_stock(threshold), self.plain.low_stock(threshold))
+        for term in TERMS:
+            self.assertEqual(self.cached.search(term), self.plain.search(term))
+
+    def test_repeated_queries_hit(self):
+        """Repeating a query is served from the cache"""
+        self.assert_same_results()
+        self.assert_same_results()
+        stats = self.cache.stats()
+        self.assertEqual(stats["misses"], 10)
+        self.assertEqual(stats["hits"], 10)
+
+    def test_results_are_copies(self):
+        """Mutating a returned result does not change later answers"""
+        ids, _, _ = self.cached.low_stock(10)
+        ids.append("bogus")
+        self.assertEqual(self.cached.low_stock(10), self.plain.low_stock(10))
+
+    def test_follows_mutations(self):
+        """Cached answers stay correct through updates, renames, inserts and removals"""
+        for step in range(200):
+            self.assert_same_results()
+            row = self.rng.randrange(len(self.plain))
+            action = step % 5
+            for store in (self.plain, self.cached):
+                if action == 0:
+                    store.set_quantity(row, (row * 7 + step) % 120)
+                elif action == 1:
+                    store.rename(row, "Item %d" % ((row + step) % 60))
+                elif action == 2:
+                    store.set_price(row, 9.5)
+                elif action == 3:
+                    store.append("N%04d" % step, "Item %d" % step, "Toys", step % 120, 1.0)
+                else:
+                    store.remove_row(row)
+        self.assert_same_results()
+
+    def test_invalidation_is_selective(self):
+        """A quantity change drops only the thresholds it can affect"""
+        store = InventoryStore.from_lists(["P1", "P2"], ["Rice", "Salt"], ["Grocery", "Grocery"],
+                                          [40, 90], [1.0, 2.0])
+        cache = store.create_query_cache()
+        for threshold in (10, 50, 100):
+            store.low_stock(threshold)
+        store.search("salt")
+        store.set_quantity(1, 60)
+        self.assertEqual(cache.stats()["invalidations"], 1)
+        self.assertEqual(store.low_stock(50), (["P1"], ["Rice"], [40]))
+        self.assertEqual(cache.stats()["hits"], 1)
+        store.set_price(0, 3.0)
+        self.assertEqual(len(cache), 3)
+
+    def test_bulk_load_clears(self):
+        """Mutations the cache did not observe are caught by the generation counter"""
+        store = build_random_store(50)
+        store.create_query_cache()
+        store.low_stock(10)
+        with store.bulk_load():
+            store.append("B1", "Bulk", "Toys", 0, 1.0)
+            self.assertIn("B1", store.low_stock(10)[0])
+        self.assertIn("B1", store.low_stock(10)[0])
+
+    def test_lru_eviction_and_ttl(self):
+        """Least recently used entries are evicted and expired entries are recomputed"""
+        now = [0.0]
+        store = build_random_store(50)
+        store.query_cache = store.attach(type(self.cache)(maxsize=2, ttl=10, clock=lambda: now[0]))
+        store.search("a")
+        store.search("b")
+        store.search("a")
+        store.search("c")
+        self.assertEqual(store.query_cache.stats()["evictions"], 1)
+        store.search("a")
+        self.assertEqual(store.query_cache.stats()["hits"], 2)
+        now[0] = 11.0
+        store.search("a")
+        stats = store.query_cache.stats()
+        self.assertEqual((stats["expirations"], stats["misses"]), (1, 4))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import random
+import unittest
+import skeleton
+from inventory import Filter
+from inventory.filters import bitmap_rows, plan, rows_to_bitmap
+from test.test_inventory_indexes import build_random_store
+
+def brute_force(store, category=None, min_quantity=None, max_quantity=None,
+                min_price=None, max_price=None, name_contains=None):
+    rows = []
+    for row in range(len(store)):
+        _, name, row_category, quantity, price = store.row(row)
+        if ((category is None or row_category == category)
+                and (min_quantity is None or quantity >= min_quantity)
+                and (max_quantity is None or quantity <= max_quantity)
+                and (min_price is None or price >= min_price)
+                and (max_price is None or price <= max_price)
+                and (name_contains is None or name_contains.lower() in name.lower())):
+            rows.append(row)
+    return rows
+
+class TestFilterEngine(unittest.TestCase):
+    def setUp(self):
+        """Build a random store with every index and a plain copy"""
+        self.rng = random.Random(3)
+        self.plain = build_random_store(400)
+        self.indexed = build_random_store(400)
+        self.indexed.create_quantity_index()
+        self.indexed.create_name_index()
+
+    def random_criteria(self):
+        criteria = {}
+        if self.rng.random() < 0.5:
+            criteria["category"] = self.rng.choice(["Grocery", "Toys", "Garden"])
+        if self.rng.random() < 0.6:
+            low = self.rng.randrange(0, 120)
+            criteria["min_quantity"] = low
+            criteria["max_quantity"] = low + self.rng.randrange(0, 40)
+        if self.rng.random() < 0.5:
+            criteria["min_price"] = self.rng.uniform(1, 400)
+        if self.rng.random() < 0.6:
+            criteria["name_contains"] = self.rng.choice(["ITEM 1", "em 4", "7", "item 3"])
+        return criteria
+
+    def test_matches_brute_force(self):
+        """Indexed and scanned filters agree with a row-by-row check"""
+        for _ in range(200):
+            criteria = self.random_criteria()
+            expected = brute_force(self.plain, **criteria)
+            self.assertEqual([p.row for p in self.plain.filter(**criteria)], expected)
+            self.assertEqual([p.row for p in self.indexed.filter(**criteria)], expected)
+
+    def test_planner_starts_from_most_selective_index(self):
+        """The cheapest index drives the plan and exact index predicates are not rechecked"""
+        steps = self.indexed.explain(min_quantity=5, max_quantity=5, name_contains="item")
+        self.assertTrue(steps[0].startswith("index quantity"))
+        self.assertEqual(steps[-1], "check name")
+        self.assertEqual(self.plain.explain(min_price=10), ["scan all rows", "check price"])
+        self.assertEqual(self.indexed.explain(category="Garden"), ["empty: no row can match"])
+        chosen = plan(self.indexed, Filter(max_quantity=60, name_contains="item 1"))
+        self.assertEqual(len(chosen.sources), 2)
+
+    def test_bitmaps(self):
+        """Row sets round-trip through int bitmaps in row order"""
+        rows = [0, 7, 8, 63, 64, 399]
+        bitmap = rows_to_bitmap(reversed(rows), 400)
+        self.assertEqual(bitmap_rows(bitmap, 400), rows)
+        self.assertEqual(bitmap_rows(bitmap & rows_to_bitmap([7, 64, 5], 400), 400), [7, 64])
+
+    def test_skeleton_filter(self):
+        """filter_products returns parallel lists and validates its arguments"""
+        self.assertEqual(skeleton.filter_products(category="Grocery", max_quantity=10, min_price=50,
+                                                  name_contains="FLOUR"),
+                         (["P002"], ["Wheat Flour 1kg"], ["Grocery"], [8], [60.0]))
+        self.assertEqual(skeleton.filter_products(min_price=1000), ([], [], [], [], []))
+        with self.assertRaises(TypeError):
+            skeleton.filter_products(max_quantity="10")
+        with self.assertRaises(TypeError):
+            skeleton.filter_products(name_contains=5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import random
+import unittest
+import skeleton
+from inventory import BKTree, InventoryStore
+from inventory.fuzzy import bounded_levenshtein, typo_distance
+from test.test_inventory_indexes import build_random_store
+
+NAMES = ["Rice 5kg", "Wheat Flour 1kg", "Mobile Charger", "Basmati Rice 1kg", "Rice Bran Oil",
+         "Charcoal", "Whole Wheat Bread", "Mobile Cover", "Price Tag"]
+
+def build_store():
+    store = InventoryStore()
+    for i, name in enumerate(NAMES):
+        store.append("P%03d" % i, name, "Grocery", i, 1.0)
+    return store
+
+class TestEditDistance(unittest.TestCase):
+    def test_distances(self):
+        """Bounded distances match known values and cap at bound + 1"""
+        self.assertEqual(bounded_levenshtein("kitten", "sitting", 5), 3)
+        self.assertEqual(bounded_levenshtein("kitten", "sitting", 2), 3)
+        self.assertEqual(bounded_levenshtein("whaet", "wheat", 5), 2)
+        self.assertEqual(typo_distance("whaet", "wheat", 5), 1)
+
+    def test_bk_tree_matches_brute_force(self):
+        """BK-tree lookups find exactly the words within the bound"""
+        rng = random.Random(2)
+        words = {"".join(rng.choice("abcde") for _ in range(rng.randrange(1, 7))) for _ in range(300)}
+        tree = BKTree()
+        for word in words:
+            tree.add(word)
+        for query in ("abc", "eeee", "a", "dcbad"):
+            for bound in (0, 1, 2):
+                expected = {w for w in words if bounded_levenshtein(query, w, 20) <= bound}
+                self.assertEqual({w for _, w in tree.search(query, bound)}, expected)
+
+class TestRankedSearch(unittest.TestCase):
+    def setUp(self):
+        self.plain = build_store()
+        self.indexed = build_store()
+        self.indexed.create_token_index()
+
+    def test_ranking(self):
+        """Exact words beat prefixes, prefixes beat typos, and ties keep row order"""
+        ids, names, scores = self.indexed.search_ranked("rice", k=3)
+        self.assertEqual(names, ["Rice 5kg", "Basmati Rice 1kg", "Rice Bran Oil"])
+        self.assertEqual(self.indexed.search_ranked("char")[1], ["Mobile Charger", "Charcoal"])
+        self.assertEqual(self.indexed.search_ranked("whaet")[1], ["Wheat Flour 1kg", "Whole Wheat Bread"])
+        self.assertEqual(self.indexed.search_ranked("mobil chrger")[1], ["Mobile Charger"])
+        self.assertEqual(self.indexed.search_ranked("zzz"), ([], [], []))
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_index_matches_scan(self):
+        """Indexed ranking equals the unindexed scoring of every row, through mutations"""
+        plain = build_random_store(300)
+        indexed = build_random_store(300)
+        indexed.create_token_index()
+        rng = random.Random(4)
+        for step in range(60):
+            for term in ("item 1", "itme", "it 4", "4", "item 33"):
+                self.assertEqual(indexed.search_ranked(term, 7), plain.search_ranked(term, 7))
+            row = rng.randrange(len(plain))
+            for store in (plain, indexed):
+                if step % 3 == 0:
+                    store.rename(row, "Item %d extra" % step)
+                elif step % 3 == 1:
+                    store.remove_row(row)
+                else:
+                    store.append("N%d" % step, "Item %d new" % step, "Toys", 1, 1.0)
+
+    def test_skeleton_validation(self):
+        """search_products_ranked validates like search_products and checks k"""
+        self.assertEqual(skeleton.search_products_ranked("wheat flor")[0], ["P002"])
+        with self.assertRaises(TypeError):
+            skeleton.search_products_ranked(None)
+        with self.assertRaises(ValueError):
+            skeleton.search_products_ranked("rice", k=0)
+
+if __name__ == '__main__':
+    unittest.main()
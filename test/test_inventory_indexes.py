@@ -0,0 +1,225 @@
+import math
+import random
+import unittest
+from inventory import InventoryStore, count_codes, dot_product
+
+def build_random_store(rows, seed=7):
+    """Build a store with random quantities, prices and categories"""
+    rng = random.Random(seed)
+    store = InventoryStore()
+    for i in range(rows):
+        store.append("P%05d" % i, "Item %d" % rng.randrange(50),
+                     rng.choice(["Grocery", "Electronics", "Toys"]),
+                     rng.randrange(0, 120), round(rng.uniform(1, 500), 2))
+    return store
+
+class TestQuantityIndex(unittest.TestCase):
+    def setUp(self):
+        """Build a random store and a second copy with a quantity index"""
+        self.rng = random.Random(11)
+        self.plain = build_random_store(300)
+        self.indexed = build_random_store(300)
+        self.indexed.create_quantity_index()
+
+    def assert_same_low_stock(self):
+        for threshold in (1, 5, 10, 50, 100):
+            self.assertEqual(self.indexed.low_stock(threshold), self.plain.low_stock(threshold))
+
+    def test_matches_scan(self):
+        """Indexed threshold queries match the full scan"""
+        self.assert_same_low_stock()
+
+    def test_follows_mutations(self):
+        """The index stays correct through updates, inserts and removals"""
+        for step in range(200):
+            row = self.rng.randrange(len(self.plain))
+            action = step % 4
+            for store in (self.plain, self.indexed):
+                if action == 0:
+                    store.set_quantity(row, (row * 7 + step) % 120)
+                elif action == 1:
+                    store.append("N%d" % step, "New %d" % step, "Toys", step % 30, 1.0)
+                elif action == 2:
+                    store.remove_row(row)
+                else:
+                    store.remove_row(len(store) - 1)
+            self.assertEqual(len(self.indexed.quantity_index), len(self.indexed))
+        self.assert_same_low_stock()
+
+    def test_follows_movement_batches(self):
+        """Batched quantity changes splice the index to the same state as a rebuild"""
+        for store in (self.plain, self.indexed):
+            store.create_id_index()
+        for step in range(30):
+            movements = [("P%05d" % self.rng.randrange(300), self.rng.randrange(0, 40))
+                         for _ in range(self.rng.randrange(1, 60))]
+            for store in (self.plain, self.indexed):
+                store.apply_movements(movements)
+            self.assert_same_low_stock()
+        keys = list(self.indexed.quantity_index._keys)
+        self.indexed.quantity_index.rebuild(self.indexed)
+        self.assertEqual(self.indexed.quantity_index._keys, keys)
+
+class TestNGramIndex(unittest.TestCase):
+    def setUp(self):
+        """Build a plain store and an n-gram indexed copy"""
+        self.plain = build_random_store(200)
+        self.indexed = build_random_store(200)
+        self.indexed.create_name_index()
+
+    def assert_same_search(self):
+        for term in ("", "i", "It", "ITEM 1", "tem 4", "m 12", "zzz", "item 49"):
+            self.assertEqual(self.indexed.search(term), self.plain.search(term))
+
+    def test_matches_scan(self):
+        """Indexed searches match the full scan, including short and empty terms"""
+        self.assert_same_search()
+
+    def test_follows_renames_and_removals(self):
+        """Renamed, added and removed rows are reflected in the index"""
+        for store in (self.plain, self.indexed):
+            store.rename(3, "Basmati Rice")
+            store.append("N1", "Brown RICE 1kg", "Grocery", 4, 90.0)
+            store.remove_row(0)
+            store.remove_row(10)
+        self.assertEqual(self.indexed.search("rice"), self.plain.search("rice"))
+        self.assertEqual(len(self.indexed.search("rice")[0]), 2)
+        self.assert_same_search()
+
+class TestCategoryCounter(unittest.TestCase):
+    def setUp(self):
+        """Build a random store with a maintained category counter"""
+        self.store = build_random_store(150)
+        self.store.create_category_counter()
+
+    def test_matches_recount(self):
+        """The maintained counts match a one-pass recount in first-seen order"""
+        self.assertEqual(self.store.category_counts(), build_random_store(150).category_counts())
+
+    def test_follows_mutations(self):
+        """Inserts, removals and recategorizations keep the counts exact"""
+        store = self.store
+        store.append("N1", "Pen", "Stationery", 5, 10.0)
+        store.recategorize(0, "Stationery")
+        store.recategorize(1, store.categories[1])
+        store.remove_row(5)
+        store.remove_row(len(store) - 1)
+        expected = {}
+        for category in store.categories:
+            expected[category] = expected.get(category, 0) + 1
+        unique, counts = store.category_counts()
+        self.assertEqual(dict(zip(unique, counts)), expected)
+
+    def test_order_matches_recount_after_mutations(self):
+        """Counter and count_codes agree on first-seen order after any mutation"""
+        store = self.store
+        rng = random.Random(5)
+        categories = ["Grocery", "Electronics", "Toys", "Books"]
+        for step in range(300):
+            action = step % 4
+            if action == 0:
+                store.recategorize(rng.randrange(len(store)), rng.choice(categories))
+            elif action == 1:
+                store.remove_row(rng.randrange(len(store)))
+            elif action == 2:
+                store.append("N%d" % step, "Pen", rng.choice(categories), 5, 10.0)
+            else:
+                store.recategorize(0, rng.choice(categories))
+            table = store.category_names
+            counts = count_codes(store.category_codes)
+            expected = ([table[code] for code in counts], list(counts.values()))
+            self.assertEqual(store.category_counts(), expected)
+        store.rebuild_observers()
+        self.assertEqual(store.category_counts(), expected)
+
+    def test_empty_category_is_dropped(self):
+        """A category with no rows left disappears from the result"""
+        store = self.store
+        row = store.append("N1", "Pen", "Stationery", 5, 10.0)
+        store.remove_row(row)
+        self.assertNotIn("Stationery", store.category_counts()[0])
+
+class TestValueTotal(unittest.TestCase):
+    def setUp(self):
+        """Build a random store with a running value total"""
+        self.rng = random.Random(3)
+        self.store = build_random_store(200)
+        self.store.create_value_total()
+
+    def exact_total(self):
+        return math.fsum(q * p for q, p in zip(self.store.quantities, self.store.prices))
+
+    def test_cold_total(self):
+        """The vectorized path matches an exactly rounded sum"""
+        self.assertAlmostEqual(dot_product(self.store.quantities, self.store.prices),
+                               self.exact_total(), places=6)
+        self.assertEqual(dot_product(self.store.quantities[:0], self.store.prices[:0]), 0.0)
+
+    def test_running_total_does_not_drift(self):
+        """Many small quantity and price updates keep the cached total exact"""
+        store = self.store
+        for step in range(20000):
+            row = self.rng.randrange(len(store))
+            if step % 2:
+                store.set_quantity(row, self.rng.randrange(0, 120))
+            else:
+                store.set_price(row, round(self.rng.uniform(0.01, 500), 2))
+            if step % 5000 == 0:
+                store.remove_row(row)
+                store.append("N%d" % step, "New", "Toys", 7, 0.1)
+        self.assertAlmostEqual(store.total_value(), self.exact_total(), places=6)
+
+class TestIdIndex(unittest.TestCase):
+    def setUp(self):
+        """Build a random store with an id index"""
+        self.store = build_random_store(100)
+        self.store.create_id_index()
+        self.store.create_quantity_index()
+
+    def test_get_update_delete(self):
+        """Products are found, changed and removed by id"""
+        store = self.store
+        self.assertEqual(store.get("P00042")[0], "P00042")
+        store.update("P00042", quantity=0, name="Renamed", category="Garden")
+        self.assertEqual(store.get("P00042")[1:4], ("Renamed", "Garden", 0))
+        self.assertIn("P00042", store.low_stock(1)[0])
+        store.delete("P00010")
+        with self.assertRaises(KeyError):
+            store.get("P00010")
+        # The former last row was swapped into the gap and is still reachable
+        self.assertEqual(store.row_of("P00099"), 10)
+        self.assertEqual(len(store.id_index), len(store))
+
+    def test_duplicate_ids_rejected(self):
+        """Appending an existing id leaves the store unchanged"""
+        with self.assertRaises(ValueError):
+            self.store.append("P00001", "Dup", "Toys", 1, 1.0)
+        with self.assertRaises(ValueError):
+            self.store.extend([("N1", "A", "Toys", 1, 1.0), ("N1", "B", "Toys", 1, 1.0)])
+        self.assertEqual(len(self.store), 100)
+
+    def test_lookup_without_index(self):
+        """row_of falls back to scanning when no id index exists"""
+        store = build_random_store(20)
+        self.assertEqual(store.row_of("P00007"), 7)
+        with self.assertRaises(KeyError):
+            store.row_of("missing")
+
+    def test_lookup_without_index_with_prefix_ids(self):
+        """Ids that prefix many other ids are found by their own row"""
+        ids = ["P%d" % i for i in range(20000)]
+        store = InventoryStore.from_lists(ids, ids, ["Toys"] * len(ids), [1] * len(ids),
+                                          [1.0] * len(ids), packed=True)
+        self.assertEqual(store.row_of("P1"), 1)
+        self.assertEqual(store.row_of("P12"), 12)
+        store.delete("P3")
+        # The last id now sits at row 3 but its bytes stay at the end of the heap
+        self.assertEqual(store.row_of("P19999"), 3)
+        self.assertEqual(store.row_of("P199"), 199)
+        with self.assertRaises(KeyError):
+            store.row_of("P3")
+        with self.assertRaises(KeyError):
+            store.row_of("P")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from urllib.request import urlopen
+from inventory import Instrumentation, InventoryStore
+from test.test_inventory_indexes import build_random_store
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.store = build_random_store(200)
+        self.instrumentation = Instrumentation()
+        self.instrumentation.enable()
+        self.addCleanup(self.instrumentation.disable)
+
+    def test_records_calls_latency_and_rows(self):
+        """Each wrapped call is counted, timed into a bucket and charged its scanned rows"""
+        self.store.low_stock(10)
+        self.store.search("item")
+        self.store.create_quantity_index()
+        low = self.store.low_stock(10)
+        self.store.update("P00001", quantity=3)
+        stats = self.instrumentation.snapshot()
+        self.assertEqual(stats["low_stock"]["calls"], 2)
+        self.assertEqual(stats["low_stock"]["rows_scanned"], 200 + len(low[0]))
+        self.assertEqual(stats["search"]["rows_scanned"], 200)
+        self.assertEqual(stats["low_stock"]["buckets"]["+Inf"], 2)
+        self.assertEqual((stats["update"]["calls"], stats["set_quantity"]["calls"]), (1, 1))
+
+    def test_streams_are_timed_while_consumed(self):
+        """Streaming queries charge the rows they examined, not the consumer's time"""
+        self.instrumentation.disable()
+        now = [0.0]
+        instrumentation = Instrumentation(clock=lambda: now[0])
+        instrumentation.enable()
+        self.addCleanup(instrumentation.disable)
+        rows = self.store.iter_search("item 1")
+        first = next(rows)
+        now[0] += 5.0
+        next(rows)
+        rows.close()
+        stats = instrumentation.snapshot()["iter_search"]
+        matches = [i for i, name in enumerate(self.store.names) if "item 1" in name.lower()]
+        self.assertEqual(first[0], self.store.product_ids[matches[0]])
+        self.assertEqual((stats["calls"], stats["rows_scanned"], stats["seconds"]),
+                         (1, matches[1] + 1, 0.0))
+        self.assertEqual(len(list(self.store.iter_low_stock(10))), len(self.store.low_stock(10)[0]))
+        self.assertEqual(instrumentation.snapshot()["iter_low_stock"]["rows_scanned"], 200)
+
+    def test_disable_restores_methods(self):
+        """Disabling puts the original functions back and keeps the metrics"""
+        original = InventoryStore.__dict__["low_stock"].__wrapped__
+        self.instrumentation.disable()
+        self.assertIs(InventoryStore.__dict__["low_stock"], original)
+        self.store.low_stock(10)
+        self.assertEqual(self.instrumentation.snapshot(), {})
+        self.instrumentation.enable()
+        with self.assertRaises(RuntimeError):
+            Instrumentation().enable()
+
+    def test_exports(self):
+        """Metrics are exported as Prometheus text and JSON, to files and over HTTP"""
+        self.store.total_value()
+        text = self.instrumentation.to_prometheus()
+        self.assertIn('inventory_operation_seconds_count{operation="total_value"} 1', text)
+        self.assertIn('inventory_operation_seconds_bucket{operation="total_value",le="+Inf"} 1', text)
+        self.assertIn('inventory_rows_scanned_total{operation="total_value"} 200', text)
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, "metrics.json")
+        self.instrumentation.write(path)
+        with open(path) as handle:
+            self.assertEqual(json.load(handle)["total_value"]["calls"], 1)
+        host, port = self.instrumentation.serve(port=0)
+        self.addCleanup(self.instrumentation.stop_serving)
+        with urlopen("http://%s:%d/metrics" % (host, port)) as response:
+            self.assertEqual(response.read().decode("utf-8"), text)
+
+    def test_profile_capture(self):
+        """The cProfile capture reports the inventory functions it saw"""
+        self.instrumentation.start_profile()
+        self.store.search("item 3")
+        report = self.instrumentation.stop_profile()
+        self.assertIn("_search", report)
+        self.assertFalse(self.instrumentation.profiling)
+
+if __name__ == '__main__':
+    unittest.main()
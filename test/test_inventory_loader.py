@@ -0,0 +1,87 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from inventory import InventoryStore, load_file
+
+class TestLoader(unittest.TestCase):
+    def setUp(self):
+        """Create a scratch directory and an indexed store"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.store = InventoryStore()
+        self.store.create_quantity_index()
+        self.store.create_value_total()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, filename, text):
+        path = os.path.join(self.tmpdir, filename)
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        return path
+
+    def test_csv_load_in_chunks(self):
+        """Valid CSV rows are loaded across chunk boundaries and indexed"""
+        lines = ["product_id,name,category,quantity,price"]
+        lines += ["P%03d,Item %d,Grocery,%d,2.5" % (i, i, i) for i in range(25)]
+        report = load_file(self.write("items.csv", "\n".join(lines) + "\n"), self.store, chunk_size=4)
+        self.assertEqual(report.rows_loaded, 25)
+        self.assertEqual(report.error_count, 0)
+        self.assertEqual(self.store.low_stock(2)[0], ["P000", "P001", "P002"])
+        self.assertAlmostEqual(self.store.total_value(), sum(range(25)) * 2.5)
+
+    def test_csv_errors_are_collected(self):
+        """Bad rows are reported by record number and the rest still load"""
+        text = ("name,product_id,category,price,quantity\n"
+                "Rice,P1,Grocery,10.0,5\n"
+                "Wheat,P2,Grocery,abc,5\n"
+                "Salt,P3,Grocery,1.0,-2\n"
+                "Short,P4\n"
+                "Sugar,P5,Grocery,3.0,7\n")
+        report = load_file(self.write("items.csv", text), self.store)
+        self.assertEqual(report.rows_loaded, 2)
+        self.assertEqual([error.row for error in report.errors], [2, 3, 4])
+        self.assertEqual(self.store.product_ids, ["P1", "P5"])
+
+    def test_jsonl_load(self):
+        """JSONL rows are typed and validated, including float quantities"""
+        rows = [
+            {"product_id": "P1", "name": "Rice", "category": "Grocery", "quantity": 5, "price": 10},
+            {"product_id": "P2", "name": "Wheat", "category": "Grocery", "quantity": 2.5, "price": 1},
+            {"product_id": "P3", "name": "Salt", "category": "Grocery", "quantity": True, "price": 1},
+        ]
+        text = "\n".join(json.dumps(row) for row in rows) + "\nnot json\n"
+        report = load_file(self.write("items.jsonl", text), self.store)
+        self.assertEqual(report.rows_loaded, 1)
+        self.assertEqual([error.row for error in report.errors], [2, 3, 4])
+        self.assertEqual(self.store.row(0), ("P1", "Rice", "Grocery", 5, 10.0))
+
+    def test_error_list_is_bounded(self):
+        """Only max_errors errors are kept but all are counted"""
+        lines = ["product_id,name,category,quantity,price"] + ["P,N,C,x,1"] * 10
+        report = load_file(self.write("bad.csv", "\n".join(lines)), self.store, max_errors=3)
+        self.assertEqual(report.error_count, 10)
+        self.assertEqual(len(report.errors), 3)
+
+    def test_duplicate_ids_reported(self):
+        """With an id index, repeated ids are reported instead of loaded"""
+        self.store.create_id_index()
+        self.store.append("P1", "Existing", "Grocery", 1, 1.0)
+        text = ("product_id,name,category,quantity,price\n"
+                "P1,Rice,Grocery,5,10.0\n"
+                "P2,Wheat,Grocery,5,1.0\n"
+                "P2,Wheat again,Grocery,5,1.0\n")
+        report = load_file(self.write("items.csv", text), self.store)
+        self.assertEqual(report.rows_loaded, 1)
+        self.assertEqual([error.row for error in report.errors], [1, 3])
+        self.assertEqual(self.store.row_of("P2"), 1)
+
+    def test_unknown_format_rejected(self):
+        """Files without a known extension need an explicit format"""
+        with self.assertRaises(ValueError):
+            load_file(self.write("items.txt", ""), self.store)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from array import array
+import skeleton
+from inventory import InventoryStore, ShardedInventory
+from test.test_inventory_indexes import build_random_store
+
+class TestShardedInventory(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Start one worker pool over a random store for all tests"""
+        cls.store = build_random_store(500)
+        cls.sharded = ShardedInventory(cls.store, workers=2, shards=5)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sharded.close()
+
+    def test_results_match_single_process(self):
+        """Every query gives the single-process answer in original row order"""
+        for threshold in (1, 10, 60):
+            self.assertEqual(self.sharded.low_stock(threshold), self.store.low_stock(threshold))
+        for term in ("", "ITEM 3", "ｉｔｅｍ 4", "nothing"):
+            self.assertEqual(self.sharded.search(term), self.store.search(term))
+        self.assertEqual(self.sharded.category_counts(), self.store.category_counts())
+        self.assertAlmostEqual(self.sharded.total_value(), self.store.total_value(), places=6)
+
+    def test_usable_as_skeleton_store(self):
+        """The skeleton functions accept a sharded inventory as store"""
+        self.assertEqual(skeleton.find_low_stock_items(10, store=self.sharded),
+                         skeleton.find_low_stock_items(10, store=self.store))
+
+    def test_parent_holds_no_row_copies(self):
+        """Result rows are read from the store, whose folded column stays unbuilt"""
+        store = InventoryStore.from_lists(["P1", "P2", "P3", "P4"], ["Straße", "Tea", "Mug", "Jam"],
+                                          ["Books", "Grocery", "Kitchen", "Grocery"], [1, 20, 3, 9],
+                                          [1.0, 2.0, 3.0, 4.0])
+        with ShardedInventory(store, workers=1) as sharded:
+            per_row = [name for name, value in vars(sharded).items()
+                       if isinstance(value, (list, array)) and len(value) == len(store)]
+            self.assertEqual(per_row, [])
+            self.assertEqual(sharded.search("STRASSE"), (["P1"], ["Straße"]))
+            self.assertEqual(sharded.low_stock(5), (["P1", "P3"], ["Straße", "Mug"], [1, 3]))
+        self.assertIsNone(store._folded_names)
+
+    def test_empty_store(self):
+        """An empty inventory shards to empty results"""
+        with ShardedInventory(InventoryStore(), workers=1) as sharded:
+            self.assertEqual(sharded.low_stock(10), ([], [], []))
+            self.assertEqual(sharded.total_value(), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+from inventory import InventoryStore, SnapshotError, open_snapshot, write_snapshot
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        """Write a small store with non-ASCII text to a snapshot file"""
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "inventory.snap")
+        self.store = InventoryStore.from_lists(
+            ["P001", "P002", "P003", "P004"],
+            ["Rice 5kg", "Wheat Flour 1kg", "Mobile Charger", "Straße Café"],
+            ["Grocery", "Grocery", "Electronics", "Café"],
+            [45, 8, 15, 3],
+            [250.00, 60.00, 300.00, 4.5])
+        write_snapshot(self.store, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_queries_run_on_mapped_file(self):
+        """All four queries give the same answers against the mapped file"""
+        with open_snapshot(self.path) as mapped:
+            self.assertEqual(len(mapped), 4)
+            self.assertEqual(mapped.row(3), self.store.row(3))
+            self.assertEqual(mapped.low_stock(10), self.store.low_stock(10))
+            self.assertEqual(mapped.search("CAFÉ"), self.store.search("CAFÉ"))
+            self.assertEqual(mapped.search("strasse")[0], ["P004"])
+            self.assertEqual(mapped.category_counts(), self.store.category_counts())
+            self.assertAlmostEqual(mapped.total_value(), self.store.total_value())
+            mapped.create_quantity_index()
+            self.assertEqual(mapped.low_stock(10), self.store.low_stock(10))
+
+    def test_mapped_store_is_read_only(self):
+        """Mutations are refused and to_store gives a writable copy"""
+        with open_snapshot(self.path) as mapped:
+            with self.assertRaises(TypeError):
+                mapped.set_quantity(0, 1)
+            for movements in ([("P001", -1)], [("P999", 1)], [("P002", -100)]):
+                with self.assertRaisesRegex(TypeError, "read-only"):
+                    mapped.apply_movements(movements)
+            self.assertEqual(mapped.row(0)[3], 45)
+            copy = mapped.to_store()
+        copy.set_quantity(0, 1)
+        self.assertEqual(copy.row(0), ("P001", "Rice 5kg", "Grocery", 1, 250.0))
+
+    def test_empty_store_round_trip(self):
+        """An empty store produces a valid, empty snapshot"""
+        write_snapshot(InventoryStore(), self.path)
+        with open_snapshot(self.path) as mapped:
+            self.assertEqual(len(mapped), 0)
+            self.assertEqual(mapped.total_value(), 0.0)
+
+    def test_rejects_other_files(self):
+        """Files that are not snapshots raise SnapshotError"""
+        bad_path = os.path.join(self.tmpdir, "bad.snap")
+        with open(bad_path, "wb") as handle:
+            handle.write(b"x" * 200)
+        with self.assertRaises(SnapshotError):
+            open_snapshot(bad_path)
+
+if __name__ == '__main__':
+    unittest.main()
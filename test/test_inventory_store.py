@@ -0,0 +1,231 @@
+import unittest
+from array import array
+from inventory import InventoryStore, Product, StringHeap, search_batch
+
+SAMPLE = (
+    ["P001", "P002", "P003"],
+    ["Rice 5kg", "Wheat Flour 1kg", "Mobile Charger"],
+    ["Grocery", "Grocery", "Electronics"],
+    [45, 8, 15],
+    [250.00, 60.00, 300.00],
+)
+
+class TestInventoryStore(unittest.TestCase):
+    def setUp(self):
+        """Build a store from the sample inventory"""
+        self.store = InventoryStore.from_lists(*SAMPLE)
+
+    def test_columns_are_typed(self):
+        """Quantities, prices and category codes are contiguous arrays"""
+        self.assertIsInstance(self.store.quantities, array)
+        self.assertIsInstance(self.store.prices, array)
+        self.assertIsInstance(self.store.category_codes, array)
+        self.assertEqual(self.store.category_names, ["Grocery", "Electronics"])
+        self.assertEqual(list(self.store.categories), SAMPLE[2])
+
+    def test_queries_match_sample(self):
+        """Queries return the same shapes as the skeleton functions"""
+        self.assertEqual(self.store.low_stock(10), (["P002"], ["Wheat Flour 1kg"], [8]))
+        self.assertEqual(self.store.search("RICE"), (["P001"], ["Rice 5kg"]))
+        self.assertEqual(self.store.search(""), (SAMPLE[0], SAMPLE[1]))
+        self.assertEqual(self.store.category_counts(), (["Grocery", "Electronics"], [2, 1]))
+        self.assertAlmostEqual(self.store.total_value(), 16230.0)
+
+    def test_mismatched_columns_rejected(self):
+        """Parallel lists of different lengths are rejected"""
+        with self.assertRaises(ValueError):
+            InventoryStore.from_lists(["P001"], [], [], [], [])
+
+    def test_bad_append_leaves_store_unchanged(self):
+        """A row with a non-numeric price is not partially added"""
+        with self.assertRaises(TypeError):
+            self.store.append("P004", "Pen", "Stationery", 3, "cheap")
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(len(self.store.quantities), 3)
+
+    def test_bad_id_leaves_store_unchanged(self):
+        """Ids must be strings and a rejected row is not partially added"""
+        with self.assertRaises(TypeError):
+            self.store.append(4, "Pen", "Stationery", 3, 1.0)
+        with self.assertRaises(TypeError):
+            self.store.extend([("P004", "Pen", "Stationery", 3, 1.0), (5, "Ink", "Stationery", 1, 2.0)])
+        with self.assertRaises(TypeError):
+            self.store.append("P004", "Pen", "Stationery", 3, "cheap")
+        self.assertEqual(len(self.store.product_ids), 3)
+        self.assertEqual(self.store.row(2), ("P003", "Mobile Charger", "Electronics", 15, 300.0))
+
+    def test_packed_layout_matches_lists(self):
+        """A packed store answers every query like the default one through mutations"""
+        packed = InventoryStore.from_lists(*SAMPLE, packed=True)
+        self.assertIsInstance(packed.product_ids, StringHeap)
+        for store in (self.store, packed):
+            store.append("P004", "Straße Map", "Books", 2, 9.5)
+            store.rename(1, "Wheat Flour 5kg")
+            store.remove_row(0)
+            store.update("P003", quantity=4)
+        self.assertEqual([packed.row(row) for row in range(len(packed))],
+                         [self.store.row(row) for row in range(len(self.store))])
+        for query, argument in (("low_stock", 5), ("search", "STRASSE"), ("search", "")):
+            self.assertEqual(getattr(packed, query)(argument), getattr(self.store, query)(argument))
+        self.assertEqual(packed.row_of("P002"), self.store.row_of("P002"))
+
+    def test_remove_row_moves_last_row(self):
+        """Removing a row swaps the last row into its place"""
+        moved = self.store.remove_row(0)
+        self.assertEqual(moved, 2)
+        self.assertEqual(self.store.product_ids, ["P003", "P002"])
+        self.assertEqual(self.store.row(0), ("P003", "Mobile Charger", "Electronics", 15, 300.0))
+        self.assertIsNone(self.store.remove_row(1))
+        self.assertEqual(len(self.store), 1)
+
+class TestStringHeap(unittest.TestCase):
+    def test_follows_a_list(self):
+        """Appends, replacements and swap-removes read back like a list, through compactions"""
+        heap = StringHeap(["Straße", "", "Rice 5kg"])
+        expected = ["Straße", "", "Rice 5kg"]
+        for step in range(3000):
+            row = step * 7 % len(expected)
+            if step % 3 == 0:
+                text = "Item %d é" % step if step % 2 else "i%d" % step
+                heap[row] = text
+                expected[row] = text
+            elif step % 3 == 1 and len(expected) > 1:
+                heap.swap_remove(row)
+                expected[row] = expected[-1]
+                expected.pop()
+            else:
+                heap.append("Name %d" % step)
+                expected.append("Name %d" % step)
+            self.assertEqual(heap[row % len(expected)], expected[row % len(expected)])
+        self.assertEqual(heap, expected)
+        self.assertLess(heap.nbytes, 2 * len("".join(expected).encode()) + 16 * len(expected) + 8192)
+        heap.compact()
+        self.assertEqual(list(heap), expected)
+
+    def test_index_finds_whole_strings(self):
+        """index matches whole rows only and returns the lowest row"""
+        heap = StringHeap(["AB", "CD", "", "BC", "CD"])
+        self.assertEqual(heap.index("BC"), 3)
+        self.assertEqual(heap.index("CD"), 1)
+        self.assertEqual(heap.index(""), 2)
+        heap[1] = "X"
+        self.assertEqual(heap.index("CD"), 4)
+        heap.swap_remove(0)
+        self.assertEqual(heap.index("CD"), 0)
+        with self.assertRaises(ValueError):
+            heap.index("ABC")
+
+class TestFoldedNames(unittest.TestCase):
+    def setUp(self):
+        """Build a store with names that lower() alone does not match"""
+        self.store = InventoryStore.from_lists(
+            ["P001", "P002", "P003"], ["Straße Map", "ＣＡＦＥ Beans", "Cafe\u0301 Mug"],
+            ["Books", "Grocery", "Kitchen"], [5, 9, 2], [10.0, 4.0, 6.0])
+
+    def test_column_is_built_on_first_read(self):
+        """Writes before the first name query leave the folded column unbuilt"""
+        store = self.store
+        store.append("P004", "TEA", "Grocery", 1, 2.0)
+        store.rename(0, "Straße Atlas")
+        store.remove_row(1)
+        self.assertIsNone(store._folded_names)
+        self.assertEqual(store.search("strasse"), (["P001"], ["Straße Atlas"]))
+        self.assertEqual(store.folded_names, ["strasse atlas", "tea", "café mug"])
+
+    def test_column_follows_writes(self):
+        """The folded column is kept in step by append, rename and remove_row"""
+        store = self.store
+        self.assertEqual(store.folded_names, ["strasse map", "cafe beans", "café mug"])
+        store.append("P004", "Tea", "Grocery", 1, 2.0)
+        store.rename(0, "STRASSE Atlas")
+        store.remove_row(1)
+        self.assertEqual(store.folded_names, ["strasse atlas", "tea", "café mug"])
+
+    def test_non_string_terms_raise_type_error(self):
+        """Every name query rejects a non-string term with TypeError"""
+        self.store.create_query_cache()
+        for query in (self.store.search, self.store.iter_search, self.store.search_ranked):
+            with self.assertRaises(TypeError):
+                list(query(5))
+        with self.assertRaises(TypeError):
+            search_batch(self.store, [b"tea"])
+
+    def test_every_search_path_folds(self):
+        """Scans, indexes, the cache, filters, batches and ranked search agree"""
+        expected = (["P001"], ["Straße Map"])
+        self.assertEqual(self.store.search("STRASSE"), expected)
+        self.assertEqual(self.store.search("café")[0], ["P003"])
+        self.assertEqual(self.store.search("cafe")[0], ["P002"])
+        self.assertEqual([row[0] for row in self.store.iter_search("straße")], ["P001"])
+        self.store.create_name_index()
+        self.store.create_token_index()
+        self.store.create_query_cache()
+        self.assertEqual(self.store.search("strasse"), expected)
+        self.assertEqual(self.store.search("STRASSE"), expected)
+        self.assertEqual([p.product_id for p in self.store.filter(name_contains="Straße")], ["P001"])
+        self.assertEqual(search_batch(self.store, ["STRASSE", "ＣＡＦＥ"]),
+                         [expected, (["P002"], ["ＣＡＦＥ Beans"])])
+        self.assertEqual(self.store.search_ranked("strase")[0], ["P001"])
+        self.store.rename(1, "Straßenkarte")
+        self.assertEqual(self.store.search("strasse")[0], ["P001", "P002"])
+
+class TestProductView(unittest.TestCase):
+    def setUp(self):
+        self.store = InventoryStore.from_lists(*SAMPLE)
+        self.store.create_value_total()
+
+    def test_reads_columns_lazily(self):
+        """Views read the current column values and carry no per-instance dict"""
+        product = self.store.product(1)
+        self.assertFalse(hasattr(product, "__dict__"))
+        self.assertEqual((product.product_id, product.name, product.category, product.quantity,
+                          product.price), ("P002", "Wheat Flour 1kg", "Grocery", 8, 60.0))
+        self.store.set_quantity(1, 9)
+        self.assertEqual(product.quantity, 9)
+        self.assertEqual([p.as_tuple() for p in self.store.products()],
+                         [self.store.row(i) for i in range(3)])
+        self.assertEqual(self.store.product(-1), Product(self.store, 2))
+        with self.assertRaises(IndexError):
+            self.store.product(3)
+
+    def test_assignment_updates_store(self):
+        """Setting fields on a view goes through the store and its indexes"""
+        product = self.store.product(0)
+        product.quantity = 10
+        product.price = 2.5
+        product.category = "Staples"
+        self.assertEqual(self.store.row(0), ("P001", "Rice 5kg", "Staples", 10, 2.5))
+        self.assertEqual(self.store.total_value(), sum(p.value for p in self.store.products()))
+
+class TestStockMovements(unittest.TestCase):
+    def setUp(self):
+        self.store = InventoryStore.from_lists(*SAMPLE)
+        self.store.create_id_index()
+        self.store.create_quantity_index()
+        self.store.create_value_total()
+
+    def test_batch_is_grouped_and_applied_once(self):
+        """Deltas are summed per product and observers see one batch call"""
+        calls = []
+        original = self.store.value_total.rows_changed
+        self.store.value_total.rows_changed = lambda *args: calls.append(args[1]) or original(*args)
+        changed = self.store.apply_movements([("P001", -5), ("P003", 10), ("P001", -35), ("P002", 0)])
+        self.assertEqual(changed, 3)
+        self.assertEqual(list(self.store.quantities), [5, 8, 25])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.store.total_value(), 5 * 250.0 + 8 * 60.0 + 25 * 300.0)
+        self.assertEqual(self.store.low_stock(8), (["P001", "P002"], ["Rice 5kg", "Wheat Flour 1kg"], [5, 8]))
+
+    def test_bad_batch_leaves_store_unchanged(self):
+        """Unknown ids, negative results and non-integer deltas reject the whole batch"""
+        for movements, error in (([("P001", 1), ("P999", 1)], KeyError),
+                                 ([("P001", 1), ("P002", -9)], ValueError),
+                                 ([("P001", 1.5)], TypeError),
+                                 ([("P001", True)], TypeError),
+                                 ([("P001", 2), ("P001", False)], TypeError)):
+            with self.assertRaises(error):
+                self.store.apply_movements(movements)
+            self.assertEqual(list(self.store.quantities), [45, 8, 15])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import types
+import unittest
+import skeleton
+from test.test_inventory_indexes import build_random_store
+
+class TestStreamingQueries(unittest.TestCase):
+    def setUp(self):
+        self.store = build_random_store(500)
+        self.store.create_quantity_index()
+        self.store.create_name_index()
+
+    def test_streams_match_lists(self):
+        """Streamed rows are the list results zipped together, in row order"""
+        for threshold in (1, 10, 50, 100):
+            self.assertEqual(list(self.store.iter_low_stock(threshold)),
+                             list(zip(*self.store.low_stock(threshold))))
+        for term in ("ITEM 1", "item 4", "x"):
+            ids, names = self.store.search(term)
+            streamed = list(self.store.iter_search(term))
+            self.assertEqual([(row[0], row[1]) for row in streamed], list(zip(ids, names)))
+            self.assertEqual([row[2] for row in streamed], [self.store.get(i)[3] for i in ids])
+
+    def test_pagination(self):
+        """limit and offset select consecutive pages of the full result"""
+        full = list(skeleton.iter_low_stock_items(50, store=self.store))
+        pages = [list(skeleton.iter_low_stock_items(50, limit=7, offset=offset, store=self.store))
+                 for offset in range(0, len(full), 7)]
+        self.assertEqual([row for page in pages for row in page], full)
+        self.assertEqual(list(skeleton.iter_search_products("item", limit=0, store=self.store)), [])
+        self.assertEqual(len(list(skeleton.iter_search_products("item", limit=3, offset=2,
+                                                                store=self.store))), 3)
+
+    def test_lazy_with_early_termination(self):
+        """Rows are produced on demand rather than materialized up front"""
+        rows = self.store.iter_search("item")
+        self.assertIsInstance(rows, types.GeneratorType)
+        self.assertEqual(next(rows)[0], "P00000")
+        rows.close()
+
+    def test_validation(self):
+        """Bad thresholds, terms and page arguments raise before iterating"""
+        with self.assertRaises(ValueError):
+            skeleton.iter_low_stock_items(0)
+        with self.assertRaises(TypeError):
+            skeleton.iter_search_products(None)
+        with self.assertRaises(ValueError):
+            skeleton.iter_search_products("rice", limit=-1)
+        with self.assertRaises(ValueError):
+            skeleton.iter_low_stock_items(10, offset="2")
+
+if __name__ == '__main__':
+    unittest.main()
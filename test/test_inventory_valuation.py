@@ -0,0 +1,89 @@
+import math
+import unittest
+import skeleton
+from inventory import GroupValue, InventoryStore, PriceBands
+from inventory.valuation import Accumulator
+from test.test_inventory_indexes import build_random_store
+
+def brute_force(values):
+    """Summarize a list of values the slow way"""
+    if not values:
+        return GroupValue(0, 0.0, None, None, None)
+    return GroupValue(len(values), math.fsum(values), min(values), max(values),
+                      math.fsum(values) / len(values))
+
+class TestValuation(unittest.TestCase):
+    def assertGroupEqual(self, group, expected):
+        """Counts and extremes match exactly, sums to within rounding"""
+        self.assertEqual(group[:1] + group[2:4], expected[:1] + expected[2:4])
+        if expected.count:
+            self.assertAlmostEqual(group.sum, expected.sum, delta=abs(expected.sum) * 1e-12)
+            self.assertAlmostEqual(group.mean, expected.mean, delta=abs(expected.mean) * 1e-12)
+        else:
+            self.assertEqual(group, expected)
+
+    def test_groups_match_brute_force(self):
+        """Every category and band group equals a separate pass over its rows"""
+        store = build_random_store(400)
+        store.remove_row(3)
+        store.recategorize(0, "Books")
+        result = store.valuation((50, 100, 250))
+        rows = [store.row(row) for row in range(len(store))]
+        expected_categories = list(dict.fromkeys(row[2] for row in rows))
+        self.assertEqual(list(result.by_category), expected_categories)
+        for category, group in result.by_category.items():
+            self.assertGroupEqual(group, brute_force([q * p for _, _, c, q, p in rows if c == category]))
+        bounds = [(-math.inf, 50), (50, 100), (100, 250), (250, math.inf)]
+        self.assertEqual(list(result.by_band), ["< 50", "50 - 100", "100 - 250", ">= 250"])
+        for (low, high), group in zip(bounds, result.by_band.values()):
+            self.assertGroupEqual(group, brute_force([q * p for _, _, _, q, p in rows if low <= p < high]))
+        self.assertGroupEqual(result.overall, brute_force([q * p for _, _, _, q, p in rows]))
+        self.assertAlmostEqual(result.overall.sum, store.total_value(), places=6)
+
+    def test_accumulator_compensates_and_merges(self):
+        """Running sums survive cancellation and merged groups equal one group"""
+        values = [1e16, 1.0, -1e16, 3.0, -2.0, 0.5]
+        whole, left, right = Accumulator(), Accumulator(), Accumulator()
+        for value in values:
+            whole.add(value)
+        for value in values[:2]:
+            left.add(value)
+        for value in values[2:]:
+            right.add(value)
+        expected = brute_force(values)
+        self.assertEqual(whole.value(), expected)
+        merged = Accumulator()
+        for part in (Accumulator(), left, Accumulator(), right):
+            merged.merge(part)
+        self.assertEqual(merged.value(), expected)
+        self.assertEqual(Accumulator().value(), GroupValue(0, 0.0, None, None, None))
+
+    def test_close_edges_keep_separate_bands(self):
+        """Edges that print alike at low precision still give one band each"""
+        store = InventoryStore.from_lists(
+            ["A", "B", "C", "D"], ["a", "b", "c", "d"], ["Toys"] * 4, [1, 1, 1, 1],
+            [1234566.5, 1234567.2, 1234568.7, 1234569.0])
+        result = store.valuation((1234567, 1234568, 1234569))
+        self.assertEqual(len(result.by_band), 4)
+        self.assertEqual([group.count for group in result.by_band.values()], [1, 1, 1, 1])
+        self.assertEqual(result.by_band["1234567 - 1234568"].sum, 1234567.2)
+
+    def test_price_bands(self):
+        """Edges start a band, empty bands are reported and bad edges are rejected"""
+        bands = PriceBands((10, 99.5))
+        self.assertEqual([bands.band(price) for price in (0, 10, 99.49, 99.5, 1e9)], [0, 1, 1, 2, 2])
+        self.assertEqual(PriceBands().labels(), ["all"])
+        self.assertEqual(PriceBands((0.5, 2)).labels(), ["< 0.5", "0.5 - 2", ">= 2"])
+        with self.assertRaises(ValueError):
+            PriceBands((10, 10))
+        with self.assertRaises(TypeError):
+            PriceBands(("10",))
+        result = skeleton.value_by_group((100, 250))
+        self.assertEqual(result.by_band["100 - 250"], GroupValue(0, 0.0, None, None, None))
+        self.assertEqual(result.by_category["Grocery"], GroupValue(2, 11730.0, 480.0, 11250.0, 5865.0))
+        self.assertEqual(result.overall.sum, skeleton.calculate_total_value())
+        with self.assertRaises(TypeError):
+            skeleton.value_by_group(None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+import unittest
+from inventory import DurableInventory
+
+ROWS = [("P001", "Rice 5kg", "Grocery", 45, 250.00),
+        ("P002", "Wheat Flour 1kg", "Grocery", 8, 60.00),
+        ("P003", "Mobile Charger", "Electronics", 15, 300.00)]
+
+class TestDurableInventory(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def reopen(self, **options):
+        return DurableInventory(self.tmpdir, fsync=False, **options)
+
+    def test_mutations_survive_reopen(self):
+        """Committed appends, updates and deletes are replayed from the log"""
+        with self.reopen() as durable:
+            durable.store.extend(ROWS)
+            durable.store.update("P002", quantity=3, price=61.5, name="Atta 1kg")
+            durable.store.update("P003", category="Gadgets")
+            durable.store.delete("P001")
+            expected = [durable.store.row(i) for i in range(len(durable.store))]
+        with self.reopen() as durable:
+            self.assertEqual(durable.replayed, 8)
+            self.assertEqual([durable.store.row(i) for i in range(len(durable.store))], expected)
+
+    def test_group_commit_writes_once_per_batch(self):
+        """Records stay buffered until commit or until group_size is reached"""
+        durable = self.reopen(group_size=2)
+        log_path = os.path.join(self.tmpdir, "wal.0.log")
+        durable.store.append(*ROWS[0])
+        self.assertEqual(os.path.getsize(log_path), 0)
+        durable.store.append(*ROWS[1])
+        size = os.path.getsize(log_path)
+        self.assertGreater(size, 0)
+        durable.store.set_quantity(0, 1)
+        self.assertEqual(os.path.getsize(log_path), size)
+        durable.commit()
+        self.assertGreater(os.path.getsize(log_path), size)
+        durable.close()
+
+    def test_uncommitted_records_are_lost(self):
+        """Only committed records are recovered after a crash"""
+        durable = self.reopen()
+        durable.store.append(*ROWS[0])
+        durable.commit()
+        durable.store.append(*ROWS[1])
+        durable._log.close()
+        with self.reopen() as recovered:
+            self.assertEqual(len(recovered.store), 1)
+
+    def test_compaction_replays_only_the_tail(self):
+        """Crossing compact_bytes checkpoints to a snapshot and starts an empty log"""
+        with self.reopen(group_size=1, compact_bytes=200) as durable:
+            for i in range(20):
+                durable.store.append("P%03d" % i, "Item %d" % i, "Grocery", i, 1.5)
+            self.assertEqual(durable.generation, 0)
+            durable.commit()
+            generation = durable.generation
+            durable.store.set_price(0, 2.0)
+        self.assertGreater(generation, 0)
+        self.assertEqual(sorted(os.listdir(self.tmpdir)),
+                         ["snapshot.%d.inv" % generation, "wal.%d.log" % generation])
+        with self.reopen() as durable:
+            self.assertLess(durable.replayed, 20)
+            self.assertEqual(len(durable.store), 20)
+            self.assertEqual(durable.store.get("P000")[4], 2.0)
+
+    def test_delete_survives_compaction(self):
+        """A delete that pushes the log past compact_bytes is not undone by the checkpoint"""
+        with self.reopen(group_size=1, compact_bytes=1) as durable:
+            durable.store.append(*ROWS[0])
+            durable.store.append(*ROWS[1])
+            durable.store.delete("P001")
+        with self.reopen() as durable:
+            self.assertEqual(durable.store.product_ids, ["P002"])
+
+    def test_extend_survives_compaction(self):
+        """Compacting during a multi-row extend does not log rows twice"""
+        rows = [("P%d" % i, "Item %d" % i, "Grocery", i, 1.0) for i in range(6)]
+        # Try every log size at which the limit can be crossed mid-extend
+        for compact_bytes in range(1, 400, 5):
+            directory = os.path.join(self.tmpdir, str(compact_bytes))
+            with DurableInventory(directory, group_size=1, compact_bytes=compact_bytes,
+                                  fsync=False) as durable:
+                durable.store.extend(rows)
+            with DurableInventory(directory, fsync=False) as durable:
+                self.assertEqual([durable.store.row(i) for i in range(len(durable.store))], rows)
+
+    def test_bulk_load_checkpoints(self):
+        """Rows added under bulk_load bypass the log and are captured by a snapshot"""
+        with self.reopen() as durable:
+            with durable.store.bulk_load():
+                durable.store.extend(ROWS)
+            self.assertEqual(durable.generation, 1)
+        with self.reopen() as durable:
+            self.assertEqual(durable.replayed, 0)
+            self.assertEqual(durable.store.total_value(), 45 * 250.0 + 8 * 60.0 + 15 * 300.0)
+
+    def test_torn_tail_is_discarded(self):
+        """A partially written last record is dropped and the log stays appendable"""
+        with self.reopen() as durable:
+            durable.store.extend(ROWS[:2])
+        log_path = os.path.join(self.tmpdir, "wal.0.log")
+        with open(log_path, "ab") as handle:
+            handle.write(b"\x40\x00\x00\x00garbage")
+        with self.reopen() as durable:
+            self.assertEqual(durable.replayed, 2)
+            durable.store.append(*ROWS[2])
+        with self.reopen() as durable:
+            self.assertEqual(len(durable.store), 3)
+
+if __name__ == '__main__':
+    unittest.main()
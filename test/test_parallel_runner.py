@@ -0,0 +1,55 @@
+import sys
+import types
+import unittest
+from test.ParallelRunner import ParallelRunner
+
+MODULES = ["test.test_inventory_store", "test.test_inventory_indexes", "test.test_inventory_batch"]
+
+class TestParallelRunner(unittest.TestCase):
+    def test_parallel_matches_serial(self):
+        """The pooled run reports the same cases and outcomes, in the same order"""
+        serial = ParallelRunner(MODULES, workers=1).run()
+        parallel = ParallelRunner(MODULES, workers=4).run()
+        self.assertTrue(serial)
+        self.assertEqual([(test_id, outcome) for test_id, outcome, _, _ in parallel],
+                         [(test_id, outcome) for test_id, outcome, _, _ in serial])
+        self.assertTrue(all(outcome == "ok" for _, outcome, _, _ in parallel))
+
+    def test_target_module_is_shared(self):
+        """Test modules with load_module_dynamically get the single shared import"""
+        runner = ParallelRunner(["test.test_boundary"], workers=2)
+        try:
+            import test.test_boundary as boundary
+        except ImportError:
+            self.skipTest("assignment test dependencies are not installed")
+        original = boundary.load_module_dynamically
+        with runner.share_target():
+            self.assertIs(boundary.load_module_dynamically(), runner.target)
+        self.assertIs(boundary.load_module_dynamically, original)
+
+    def test_run_restores_test_modules(self):
+        """Cases see the shared import during run() and the original function afterwards"""
+        module = types.ModuleType("test._parallel_runner_probe")
+        target = types.ModuleType("target")
+        seen = []
+
+        class Probe(unittest.TestCase):
+            def test_probe(self):
+                seen.append(module.load_module_dynamically())
+
+        def original():
+            return None
+
+        module.Probe = Probe
+        module.load_module_dynamically = original
+        sys.modules[module.__name__] = module
+        try:
+            results = ParallelRunner([module.__name__], workers=2, target=target).run()
+        finally:
+            del sys.modules[module.__name__]
+        self.assertEqual([outcome for _, outcome, _, _ in results], ["ok"])
+        self.assertEqual(seen, [target])
+        self.assertIs(module.load_module_dynamically, original)
+
+if __name__ == '__main__':
+    unittest.main()
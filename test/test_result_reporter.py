@@ -0,0 +1,102 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from test.ResultReporter import ResultReporter
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Records posted bodies and answers with the server's scripted statuses"""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        server = self.server
+        with server.lock:
+            server.bodies.append(json.loads(body))
+            status = server.statuses.pop(0) if server.statuses else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+class TestResultReporter(unittest.TestCase):
+    def setUp(self):
+        """Start a local stand-in server and write a custom.ih file"""
+        self.server = HTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.server.lock = threading.Lock()
+        self.server.bodies = []
+        self.server.statuses = []
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.tmpdir = tempfile.mkdtemp()
+        self.custom_path = os.path.join(self.tmpdir, "custom.ih")
+        with open(self.custom_path, "w") as handle:
+            handle.write("custom-data")
+        self.url = "http://127.0.0.1:%d/push" % self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmpdir)
+
+    def make_reporter(self, **kwargs):
+        return ResultReporter(self.url, "guid", custom_path=self.custom_path, backoff=0.01, **kwargs)
+
+    def test_results_are_sent_as_one_batch(self):
+        """Many assertions produce a single POST carrying every result"""
+        reporter = self.make_reporter()
+        for i in range(20):
+            reporter.report("Test%d" % i, i % 2 == 0, "functional")
+        reporter.close()
+        self.assertEqual(len(self.server.bodies), 1)
+        batch = self.server.bodies[0]
+        self.assertEqual(len(batch), 20)
+        first = json.loads(batch[0]["testCaseResults"])["guid"]
+        self.assertEqual(first["methodName"], "Test0")
+        self.assertEqual(first["status"], "Passed")
+        self.assertEqual(batch[0]["customData"], "custom-data")
+
+    def test_server_errors_are_retried(self):
+        """5xx responses are retried with backoff until the post succeeds"""
+        self.server.statuses = [503, 500]
+        reporter = self.make_reporter()
+        reporter.report("Test", True, "boundary")
+        reporter.flush(timeout=5)
+        self.assertEqual(len(self.server.bodies), 3)
+        reporter.close()
+
+    def test_rejected_batch_falls_back_to_single_posts(self):
+        """A 4xx on the array re-sends each result on its own"""
+        self.server.statuses = [400]
+        reporter = self.make_reporter()
+        reporter.report("A", True, "exception")
+        reporter.report("B", False, "exception")
+        reporter.close()
+        self.assertEqual(len(self.server.bodies), 3)
+        self.assertIsInstance(self.server.bodies[1], dict)
+
+    def test_flush_after_close_returns(self):
+        """Flushing a closed reporter does not wait for a stopped thread"""
+        reporter = self.make_reporter()
+        reporter.report("A", True, "functional")
+        reporter.close()
+        finished = threading.Event()
+        threading.Thread(target=lambda: (reporter.flush(), finished.set()), daemon=True).start()
+        self.assertTrue(finished.wait(5))
+        self.assertEqual(len(self.server.bodies), 1)
+
+    def test_custom_data_read_once(self):
+        """custom.ih is read on the first result only"""
+        reporter = self.make_reporter()
+        reporter.report("A", True, "functional")
+        os.remove(self.custom_path)
+        reporter.report("B", True, "functional")
+        reporter.close()
+        self.assertEqual(len(self.server.bodies[0]), 2)
+
+if __name__ == '__main__':
+    unittest.main()